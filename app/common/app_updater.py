@@ -8,8 +8,12 @@ import sys
 import subprocess
 import time
 import tempfile
+import json
+import threading
 import zipfile
+import zlib
 import shutil
+import traceback
 from datetime import datetime
 from pathlib import Path
 from typing import Optional, Tuple, Callable
@@ -18,7 +22,9 @@ import requests
 from PyQt6.QtCore import QThread, pyqtSignal
 from loguru import logger
 
-from .config import ROOTPATH
+from .config import ROOTPATH, cfg
+from .download_cache import downloadCache, sha256_of, verify, HashMismatch
+from .zip_extract import extract_zip
 from .setting import VERSION, REPO_URL
 
 
@@ -36,6 +42,34 @@ def _is_packaged() -> bool:
     return False
 
 
+# 缓存上一次查询到的 Release 信息和 ETag
+RELEASE_STATE_FILE = Path(ROOTPATH) / "appData" / "update_check.json"
+# 两次自动检查之间的最短间隔（秒），间隔内直接使用缓存的结果
+MIN_CHECK_INTERVAL = 6 * 3600
+
+
+def _load_release_state() -> dict:
+    try:
+        with open(RELEASE_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_release_state(state: dict):
+    RELEASE_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(RELEASE_STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+
+
+def _asset_digest(download_url: str) -> Optional[str]:
+    """缓存的 Release 信息中该下载地址对应的 SHA-256（GitHub 的 asset digest），没有时返回 None"""
+    release = _load_release_state().get("release") or {}
+    if release.get("download_url") == download_url:
+        return release.get("sha256")
+    return None
+
+
 class UpdateChecker(QThread):
     """检查更新的线程"""
     
@@ -43,51 +77,105 @@ class UpdateChecker(QThread):
     checkFinished = pyqtSignal(bool, str, str, str)
     checkError = pyqtSignal(str)
     
-    def __init__(self, parent=None):
+    def __init__(self, force: bool = False, parent=None):
+        """force: 手动检查时忽略最短检查间隔（仍然使用 ETag 条件请求）"""
         super().__init__(parent)
         self.repo_owner = "miniLQ"
         self.repo_name = "onemore"
+        self.force = force
         
     def run(self):
         """检查 GitHub Releases 获取最新版本"""
         try:
-            api_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
-            logger.info(f"正在检查更新: {api_url}")
-            
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200:
-                self.checkError.emit(f"检查更新失败: HTTP {response.status_code}")
-                return
-            
-            data = response.json()
-            #logger.info(data)
-            latest_version = data.get("tag_name", "")
-            release_notes = data.get("body", "无更新说明")
-            
-            # 查找 Windows 可执行文件或 zip 包
-            download_url = None
-            for asset in data.get("assets", []):
-                name = asset.get("name", "").lower()
-                if name.endswith(".zip") or name.endswith(".exe"):
-                    download_url = asset.get("browser_download_url")
-                    break
-            
-            if not download_url:
-                self.checkError.emit("未找到可下载的更新包")
+            state = _load_release_state()
+            release = self._fetch_release(state)
+            if release is None:
                 return
-            
+
             # 比较版本
+            latest_version = release["tag_name"]
             current = self._parse_version(VERSION)
             latest = self._parse_version(latest_version)
             
             has_update = latest > current
             logger.info(f"当前版本: {VERSION}, 最新版本: {latest_version}, 有更新: {has_update}")
             
-            self.checkFinished.emit(has_update, latest_version, download_url, release_notes)
+            self.checkFinished.emit(has_update, latest_version, release["download_url"], release["body"])
             
         except Exception as e:
             logger.error(f"检查更新失败: {e}")
             self.checkError.emit(f"检查更新失败: {str(e)}")
+
+    def _fetch_release(self, state: dict) -> Optional[dict]:
+        """返回最新 Release 的信息，优先使用本地缓存；失败时发出 checkError 并返回 None"""
+        cached = state.get("release")
+        now = time.time()
+
+        if cached and not self.force and now - state.get("checked_at", 0) < MIN_CHECK_INTERVAL:
+            logger.info("距离上次检查更新时间较短，使用缓存的 Release 信息")
+            return cached
+        if cached and now < state.get("rate_limit_reset", 0):
+            logger.info("GitHub API 请求次数已用完，使用缓存的 Release 信息")
+            return cached
+
+        api_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/releases/latest"
+        logger.info(f"正在检查更新: {api_url}")
+
+        headers = {"Accept": "application/vnd.github+json"}
+        if cached and state.get("etag"):
+            # 304 不计入 GitHub 的请求次数限制
+            headers["If-None-Match"] = state["etag"]
+        response = requests.get(api_url, headers=headers, timeout=10)
+
+        if response.status_code == 304:
+            logger.info("Release 信息未变化")
+            state["checked_at"] = now
+            _save_release_state(state)
+            return cached
+
+        if response.status_code in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = int(response.headers.get("X-RateLimit-Reset", 0))
+            state["rate_limit_reset"] = reset
+            _save_release_state(state)
+            if cached:
+                logger.warning("GitHub API 请求次数已用完，使用缓存的 Release 信息")
+                return cached
+            self.checkError.emit(
+                f"检查更新失败: GitHub API 请求次数已用完，请在 {datetime.fromtimestamp(reset):%H:%M} 后重试")
+            return None
+
+        if response.status_code != 200:
+            self.checkError.emit(f"检查更新失败: HTTP {response.status_code}")
+            return None
+
+        data = response.json()
+        asset = self._pick_asset(data.get("assets", []))
+        if asset is None:
+            self.checkError.emit("未找到可下载的更新包")
+            return None
+
+        digest = asset.get("digest") or ""
+        release = {
+            "tag_name": data.get("tag_name", ""),
+            "body": data.get("body") or "无更新说明",
+            "download_url": asset.get("browser_download_url"),
+            "sha256": digest[len("sha256:"):] if digest.startswith("sha256:") else None,
+        }
+        _save_release_state({
+            "etag": response.headers.get("ETag", ""),
+            "checked_at": now,
+            "release": release,
+        })
+        return release
+
+    @staticmethod
+    def _pick_asset(assets: list) -> Optional[dict]:
+        """选择更新包：优先 zip，其次 exe"""
+        for suffix in (".zip", ".exe"):
+            for asset in assets:
+                if asset.get("name", "").lower().endswith(suffix) and asset.get("browser_download_url"):
+                    return asset
+        return None
     
     def _parse_version(self, version_str: str) -> Tuple[int, int, int]:
         """解析版本号，支持 v2.0.5 或 2.0.5 格式"""
@@ -102,6 +190,15 @@ class UpdateChecker(QThread):
         except:
             return (0, 0, 0)
 
+# 更新包下载：分块大小、每个分段的最小字节数、进度信号间隔（秒）、每个分段的重试次数
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+PROGRESS_INTERVAL = 0.1
+SEGMENT_RETRIES = 5
+# (连接超时, 读取超时)
+DOWNLOAD_TIMEOUT = (10, 30)
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
 
 class UpdateDownloader(QThread):
     """下载更新包的线程"""
@@ -111,10 +208,13 @@ class UpdateDownloader(QThread):
     # 信号：(成功, 下载文件路径或错误信息)
     downloadFinished = pyqtSignal(bool, str)
     
-    def __init__(self, download_url: str, parent=None):
+    def __init__(self, download_url: str, sha256: Optional[str] = None, parent=None):
+        """sha256: 更新包的期望哈希，未指定时使用检查更新时 GitHub 提供的 asset digest"""
         super().__init__(parent)
         self.download_url = download_url
+        self.expected_sha256 = sha256 or _asset_digest(download_url)
         self.save_path = None
+        self.session = None
         
     def run(self):
         """下载更新文件"""
@@ -129,18 +229,44 @@ class UpdateDownloader(QThread):
             
             logger.info(f"开始下载更新: {self.download_url}")
             logger.info(f"保存路径: {self.save_path}")
+
+            # 发布包地址中带有版本号，同一地址的内容不会变化，可以直接复用缓存
+            cached = downloadCache.lookup(self.expected_sha256, alias=self.download_url)
+            if cached:
+                downloadCache.materialize(cached, str(self.save_path))
+                size = os.path.getsize(cached)
+                self.progressChanged.emit(size, size)
+                logger.info(f"使用缓存的更新包: {cached}")
+                self.downloadFinished.emit(True, str(self.save_path))
+                return
             
-            # 下载文件
-            response = requests.get(self.download_url, stream=True, timeout=30)
-            total_size = int(response.headers.get('content-length', 0))
-            
-            downloaded = 0
-            with open(self.save_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        self.progressChanged.emit(downloaded, total_size)
+            part_path = str(self.save_path) + ".part"
+            connections = cfg.get(cfg.updateConnections)
+            self.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=connections)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+
+            total_size, validator = self._probe()
+            if total_size and validator is not None:
+                self._download_segmented(part_path, total_size, validator, connections)
+            else:
+                logger.info("服务器不支持断点续传，使用单连接下载")
+                self._download_single(part_path)
+
+            hasher = sha256_of(part_path)
+            try:
+                verify(hasher.hexdigest(), self.expected_sha256)
+            except HashMismatch:
+                os.remove(part_path)
+                raise
+
+            # 存入缓存后再放到保存路径，更新助手会删除保存路径下的文件
+            cached = downloadCache.store(str(part_path), hasher.hexdigest(), alias=self.download_url)
+            if cached:
+                downloadCache.materialize(cached, str(self.save_path))
+            else:
+                os.replace(part_path, self.save_path)
             
             logger.info(f"更新包下载完成: {self.save_path}")
             self.downloadFinished.emit(True, str(self.save_path))
@@ -149,6 +275,427 @@ class UpdateDownloader(QThread):
             logger.error(f"下载更新失败: {e}")
             self.downloadFinished.emit(False, f"下载失败: {str(e)}")
 
+    def _probe(self) -> Tuple[int, Optional[str]]:
+        """
+        请求第一个字节，返回 (文件大小, 校验标识)
+        服务器不支持 Range 时校验标识为 None
+        """
+        headers = {"Range": "bytes=0-0"}
+        with self.session.get(self.download_url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as resp:
+            resp.raise_for_status()
+            total = resp.headers.get("Content-Range", "").rsplit("/", 1)[-1]
+            if resp.status_code == 206 and total.isdigit():
+                return int(total), resp.headers.get("ETag") or resp.headers.get("Last-Modified", "")
+            return int(resp.headers.get("content-length", 0)), None
+
+    def _download_single(self, part_path: str):
+        """单连接流式下载（服务器不支持 Range 时使用）"""
+        with self.session.get(self.download_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as resp:
+            resp.raise_for_status()
+            total_size = int(resp.headers.get('content-length', 0))
+            downloaded = 0
+            last_emit = 0.0
+            with open(part_path, 'wb') as f:
+                for chunk in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        now = time.monotonic()
+                        if now - last_emit >= PROGRESS_INTERVAL:
+                            last_emit = now
+                            self.progressChanged.emit(downloaded, total_size)
+        self.progressChanged.emit(downloaded, total_size)
+
+        if total_size and downloaded < total_size:
+            raise IOError(f"下载不完整: {downloaded}/{total_size}")
+
+    def _download_segmented(self, part_path: str, total_size: int, validator: str, connections: int):
+        """
+        多连接分段下载到预先分配好大小的 part_path
+        每个分段记录为 [起始, 结束(不含), 已写到的位置]，保存在 part_path + ".json" 中，
+        中断后再次下载同一文件时从已写到的位置继续
+        """
+        state_path = part_path + ".json"
+        segments = self._load_segments(part_path, state_path, total_size, validator)
+        if segments is None:
+            count = max(1, min(connections, total_size // MIN_SEGMENT_SIZE))
+            step = -(-total_size // count)
+            segments = [[start, min(start + step, total_size), start] for start in range(0, total_size, step)]
+            with open(part_path, "wb") as f:
+                f.truncate(total_size)
+        else:
+            done = sum(seg[2] - seg[0] for seg in segments)
+            logger.info(f"继续未完成的下载: {done}/{total_size} 字节")
+
+        lock = threading.Lock()
+        errors = []
+        workers = [
+            threading.Thread(target=self._fetch_segment, args=(part_path, seg, validator, lock, errors), daemon=True)
+            for seg in segments if seg[2] < seg[1]
+        ]
+        logger.info(f"分段下载: {len(segments)} 段, {len(workers)} 个连接")
+        for worker in workers:
+            worker.start()
+
+        # 进度按固定频率合并发出，同时保存断点信息
+        while any(worker.is_alive() for worker in workers):
+            time.sleep(PROGRESS_INTERVAL)
+            with lock:
+                done = sum(seg[2] - seg[0] for seg in segments)
+                snapshot = [list(seg) for seg in segments]
+            self.progressChanged.emit(done, total_size)
+            self._save_segments(state_path, total_size, validator, snapshot)
+
+        done = sum(seg[2] - seg[0] for seg in segments)
+        self.progressChanged.emit(done, total_size)
+        self._save_segments(state_path, total_size, validator, segments)
+        if errors:
+            raise errors[0]
+        if done < total_size:
+            raise IOError(f"下载不完整: {done}/{total_size}")
+        os.remove(state_path)
+
+    def _fetch_segment(self, part_path: str, seg: list, validator: str, lock, errors: list):
+        """下载一个分段，连接中断时从已写到的位置重试"""
+        for attempt in range(1, SEGMENT_RETRIES + 1):
+            if errors:
+                return
+            try:
+                headers = {"Range": f"bytes={seg[2]}-{seg[1] - 1}"}
+                if validator:
+                    # 服务器上的文件变化时返回 200，而不是拼接出错误的文件
+                    headers["If-Range"] = validator
+                with self.session.get(self.download_url, headers=headers, stream=True,
+                                      timeout=DOWNLOAD_TIMEOUT) as resp:
+                    resp.raise_for_status()
+                    if resp.status_code != 206:
+                        raise IOError("服务器上的更新包已变化，请重新下载")
+                    # 不使用缓冲，保存的断点位置不会超过实际写入磁盘的数据
+                    with open(part_path, "r+b", buffering=0) as f:
+                        f.seek(seg[2])
+                        for chunk in resp.iter_content(DOWNLOAD_CHUNK_SIZE):
+                            chunk = chunk[:seg[1] - seg[2]]
+                            if not chunk:
+                                continue
+                            f.write(chunk)
+                            with lock:
+                                seg[2] += len(chunk)
+                if seg[2] >= seg[1]:
+                    return
+                raise requests.ConnectionError(f"分段提前结束: {seg[2]}/{seg[1]}")
+            except RETRYABLE_ERRORS as e:
+                if attempt == SEGMENT_RETRIES:
+                    errors.append(e)
+                    return
+                logger.warning(f"分段 {seg[0]} 下载中断，第 {attempt} 次重试: {e}")
+                time.sleep(attempt)
+            except Exception as e:
+                errors.append(e)
+                return
+
+    @staticmethod
+    def _load_segments(part_path: str, state_path: str, total_size: int, validator: str):
+        """读取上次的断点信息，文件大小或校验标识不一致时返回 None"""
+        if not validator or not os.path.exists(part_path):
+            return None
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception:
+            return None
+        if state.get("size") != total_size or state.get("validator") != validator:
+            return None
+        if os.path.getsize(part_path) != total_size:
+            return None
+        return state.get("segments")
+
+    @staticmethod
+    def _save_segments(state_path: str, total_size: int, validator: str, segments: list):
+        if not validator:
+            return
+        with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"size": total_size, "validator": validator, "segments": segments}, f)
+        os.replace(state_path + ".tmp", state_path)
+
+
+# 已安装文件清单：{相对路径: [大小, mtime_ns, crc32]}，更新时用来判断哪些文件需要替换
+INSTALL_MANIFEST = Path("appData") / "install_manifest.json"
+# 保存用户数据的目录，已存在时不会被更新包覆盖，也不计入程序快照
+PRESERVED_DIRS = ("app", "appData", "plugins", "tools")
+# 更新过程使用的目录：快照、解压临时目录、待删除文件（下次启动时清理）
+BACKUP_DIR = "backup"
+STAGING_DIR = "_update_temp"
+TRASH_DIR = "_to_delete"
+# 快照中记录文件列表的文件名、保留的快照数量
+SNAPSHOT_MANIFEST = "snapshot.json"
+MAX_SNAPSHOTS = 3
+
+
+def _file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _load_install_manifest(app_dir: Path) -> dict:
+    try:
+        with open(app_dir / INSTALL_MANIFEST, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except Exception:
+        return {}
+
+
+def _save_install_manifest(app_dir: Path, files: dict):
+    path = app_dir / INSTALL_MANIFEST
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": VERSION, "files": files}, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _is_unchanged(path: Path, rel: str, info: zipfile.ZipInfo, manifest: dict) -> bool:
+    """已安装文件与更新包中的文件是否相同；大小和修改时间未变时直接使用清单中记录的 CRC32"""
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    if st.st_size != info.file_size:
+        return False
+    cached = manifest.get(rel)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2] == info.CRC
+    return _file_crc32(path) == info.CRC
+
+
+def _program_files(app_dir: Path):
+    """应用目录中的程序文件（相对路径），不含用户数据目录和更新过程使用的目录"""
+    skip = set(PRESERVED_DIRS) | {BACKUP_DIR, STAGING_DIR, TRASH_DIR}
+    for root, dirs, files in os.walk(app_dir):
+        if Path(root) == app_dir:
+            dirs[:] = [d for d in dirs if d not in skip]
+        for name in files:
+            yield (Path(root) / name).relative_to(app_dir).as_posix()
+
+
+def _link_or_copy(src: Path, dst: Path):
+    """优先创建硬链接，文件系统不支持时复制"""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _move_to_trash(app_dir: Path, trash_dir: Path, rel: str):
+    """把文件移出应用目录（正在运行的 exe 不能删除或覆盖，但可以重命名）"""
+    dest = trash_dir / rel
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(app_dir / rel, dest)
+
+
+def create_snapshot(app_dir: Path, snapshot_dir: Path, log_print: Callable = print):
+    """
+    为当前程序文件创建快照
+    更新和回滚都通过重命名替换文件而不会原地修改，所以快照可以直接硬链接到已安装的文件，
+    未变化的文件不占用额外空间
+    """
+    files = sorted(_program_files(app_dir))
+    for rel in files:
+        _link_or_copy(app_dir / rel, snapshot_dir / "files" / rel)
+
+    manifest = _load_install_manifest(app_dir)
+    with open(snapshot_dir / SNAPSHOT_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": VERSION,
+            "files": files,
+            "manifest": {rel: manifest[rel] for rel in files if rel in manifest},
+        }, f, indent=1)
+    log_print(f"  ✓ 已创建快照: {snapshot_dir.name}（{len(files)} 个文件）")
+
+
+def restore_snapshot(app_dir: Path, snapshot_dir: Path, trash_dir: Path, log_print: Callable = print):
+    """把程序文件恢复为快照中的版本，与快照相同的文件不做任何操作"""
+    with open(snapshot_dir / SNAPSHOT_MANIFEST, "r", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    files = snapshot["files"]
+
+    restored = 0
+    for rel in files:
+        src = snapshot_dir / "files" / rel
+        target = app_dir / rel
+        if target.exists():
+            if os.path.samefile(src, target):
+                continue
+            _move_to_trash(app_dir, trash_dir, rel)
+        _link_or_copy(src, target)
+        restored += 1
+
+    extra = set(_program_files(app_dir)) - set(files)
+    for rel in extra:
+        _move_to_trash(app_dir, trash_dir, rel)
+
+    _save_install_manifest(app_dir, snapshot.get("manifest", {}))
+    log_print(f"  ✓ 已恢复到版本 {snapshot.get('version', '未知')}：替换 {restored} 个文件，删除 {len(extra)} 个文件")
+
+
+def prune_snapshots(app_dir: Path, keep: int = MAX_SNAPSHOTS, log_print: Callable = print, exclude=()):
+    """只保留最近 keep 份快照；exclude 中的快照（例如刚刚回滚到的版本）不会被删除，但计入 keep"""
+    backup_root = app_dir / BACKUP_DIR
+    if not backup_root.exists():
+        return
+    dirs = [d for d in backup_root.iterdir() if d.is_dir()]
+    backups = sorted((d for d in dirs if d.name not in exclude), key=lambda d: d.name)
+    keep = max(keep - (len(dirs) - len(backups)), 0)
+    while len(backups) > keep:
+        oldest = backups.pop(0)
+        try:
+            shutil.rmtree(oldest)
+            log_print(f"  ✓ 已删除旧快照: {oldest.name}")
+        except Exception as e:
+            log_print(f"  ✗ 删除旧快照失败 {oldest.name}: {e}")
+
+
+def apply_zip_update(zip_path: Path, app_dir: Path, trash_dir: Path,
+                     log_print: Callable = print, set_status: Callable = lambda msg: None):
+    """
+    按文件差异安装 zip 更新包
+    只解压并替换内容有变化的文件；被替换和已从更新包中移除的旧文件移动到 trash_dir，
+    替换过程中出错时全部还原
+    """
+    manifest = _load_install_manifest(app_dir)
+    preserved = {d for d in PRESERVED_DIRS if (app_dir / d).exists()}
+    staging = app_dir / STAGING_DIR
+
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        infos = [i for i in zf.infolist() if not i.is_dir()]
+
+        # 以层级最浅的 main.exe 所在目录作为程序根目录
+        roots = sorted(
+            (i.filename[:-len("main.exe")] for i in infos
+             if i.filename == "main.exe" or i.filename.endswith("/main.exe")),
+            key=len
+        )
+        if not roots:
+            raise FileNotFoundError("更新包中未找到 main.exe")
+        prefix = roots[0]
+        log_print(f"  ✓ 定位主程序目录: {prefix or '/'}")
+
+        packaged = {}
+        changed = []
+        for info in infos:
+            if not info.filename.startswith(prefix):
+                continue
+            rel = info.filename[len(prefix):]
+            parts = rel.split("/")
+            if parts[0] in preserved:
+                continue
+            if ".." in parts:
+                raise ValueError(f"更新包中存在非法路径: {info.filename}")
+            packaged[rel] = info
+            if not _is_unchanged(app_dir / rel, rel, info, manifest):
+                changed.append(rel)
+
+        # 只删除上一次安装时存在、新版本中已移除的文件
+        removed = [rel for rel in manifest
+                   if rel not in packaged and rel.split("/")[0] not in preserved and (app_dir / rel).is_file()]
+        log_print(f"  ✓ 共 {len(packaged)} 个文件，{len(changed)} 个需要更新，{len(removed)} 个需要删除")
+
+    # 只解压有变化的文件，多线程并行
+    set_status("正在解压更新文件...")
+    shutil.rmtree(staging, ignore_errors=True)
+    extract_zip(
+        str(zip_path), str(staging),
+        members={packaged[rel].filename: rel for rel in changed},
+        progress=lambda done, total: set_status(f"正在解压更新文件 ({done * 100 // max(total, 1)}%)...")
+    )
+
+    # 旧文件先移走再放入新文件，快照中的硬链接仍指向旧文件
+    set_status("正在安装更新...")
+    backed_up = []
+    installed = []
+    try:
+        for rel in changed + removed:
+            target = app_dir / rel
+            if target.exists():
+                _move_to_trash(app_dir, trash_dir, rel)
+                backed_up.append(rel)
+            if rel in packaged:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staging / rel, target)
+                installed.append(rel)
+    except Exception as e:
+        log_print(f"  ✗ 安装失败，正在还原: {e}")
+        for rel in installed:
+            (app_dir / rel).unlink(missing_ok=True)
+        for rel in backed_up:
+            os.replace(trash_dir / rel, app_dir / rel)
+        raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    log_print(f"  ✓ 已更新 {len(installed)} 个文件，已删除 {len(removed)} 个文件")
+
+    files = {}
+    for rel, info in packaged.items():
+        st = (app_dir / rel).stat()
+        files[rel] = [st.st_size, st.st_mtime_ns, info.CRC]
+    _save_install_manifest(app_dir, files)
+
+
+# 更新助手等待主程序退出的最长时间（秒）
+PARENT_EXIT_TIMEOUT = 30
+# 更新失败时提示窗口停留的时间（秒）
+UPDATE_FAILED_DELAY = 3
+
+
+def _wait_for_process_exit(pid: int, timeout: float, tick: Callable = None, interval: float = 0.1) -> bool:
+    """等待进程退出，返回进程是否已在 timeout 秒内退出；tick 在每次轮询时调用"""
+    deadline = time.monotonic() + timeout
+    if sys.platform == 'win32':
+        import ctypes
+        SYNCHRONIZE = 0x00100000
+        WAIT_TIMEOUT = 0x00000102
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        if not handle:
+            # 进程已经不存在
+            return True
+        try:
+            while True:
+                if kernel32.WaitForSingleObject(handle, int(interval * 1000)) != WAIT_TIMEOUT:
+                    return True
+                if time.monotonic() >= deadline:
+                    return False
+                if tick:
+                    tick()
+        finally:
+            kernel32.CloseHandle(handle)
+
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        if tick:
+            tick()
+        time.sleep(interval)
+
+
+def _start_app(app_dir: Path):
+    main_exe = app_dir / "main.exe"
+    if main_exe.exists():
+        os.startfile(str(main_exe))
+    else:
+        for exe in app_dir.glob("*.exe"):
+            os.startfile(str(exe))
+            break
+
 
 class AppUpdater:
     """应用程序更新管理器"""
@@ -158,12 +705,13 @@ class AppUpdater:
         self.checker = None
         self.downloader = None
         
-    def check_update(self, callback: Optional[Callable] = None):
+    def check_update(self, callback: Optional[Callable] = None, force: bool = False):
         """
         检查更新
         callback: 回调函数，参数为 (has_update, version, download_url, release_notes) 或 (error_msg)
+        force: 手动检查时传入 True，忽略最短检查间隔
         """
-        self.checker = UpdateChecker()
+        self.checker = UpdateChecker(force)
         
         if callback:
             self.checker.checkFinished.connect(
@@ -217,18 +765,15 @@ class AppUpdater:
             
             logger.info("准备启动更新助手...")
 
-            # 通过当前可执行文件启动更新助手（避免依赖外部 Python）
+            # 通过当前可执行文件启动更新助手（避免依赖外部 Python），
+            # 传入当前进程号，更新助手等待本进程退出后再开始替换文件
+            args = [sys.executable, "--update-helper", str(update_path), "--parent-pid", str(os.getpid())]
             if sys.platform == 'win32':
-                subprocess.Popen(
-                    [sys.executable, "--update-helper", str(update_path)],
-                    creationflags=subprocess.CREATE_NEW_CONSOLE
-                )
+                subprocess.Popen(args, creationflags=subprocess.CREATE_NEW_CONSOLE)
             else:
-                subprocess.Popen([sys.executable, "--update-helper", str(update_path)])
+                subprocess.Popen(args)
             
-            # 延迟退出，让辅助脚本启动
             logger.info("正在退出应用以安装更新...")
-            time.sleep(2)
             
             # 退出当前应用
             sys.exit(0)
@@ -238,8 +783,11 @@ class AppUpdater:
             raise
 
     @staticmethod
-    def run_update_helper(update_file: str):
-        """更新助手执行逻辑（由打包后的 exe 以参数触发）"""
+    def run_update_helper(update_file: str, parent_pid: Optional[int] = None):
+        """
+        更新助手执行逻辑（由打包后的 exe 以参数触发）
+        parent_pid: 启动更新助手的主程序进程号，等待其退出后再替换文件
+        """
         update_path = Path(update_file)
 
         # 计算应用目录
@@ -248,9 +796,10 @@ class AppUpdater:
         else:
             app_dir = Path(ROOTPATH)
 
-        # 生成带时间戳的备份目录
+        # 生成带时间戳的快照目录
         timestamp = datetime.now().strftime("%Y-%m-%d-%H%M%S")
-        backup_dir = app_dir / "backup" / timestamp
+        backup_dir = app_dir / BACKUP_DIR / timestamp
+        trash_dir = app_dir / TRASH_DIR / timestamp
         
         # 创建日志文件
         log_dir = app_dir / "appData" / "log"
@@ -306,6 +855,11 @@ class AppUpdater:
                 update_label.setText(msg)
                 update_app.processEvents()
 
+        def set_status_tick():
+            """等待期间保持提示窗口响应"""
+            if update_app is not None:
+                update_app.processEvents()
+
         log_print("=" * 60)
         log_print("OneMore 自动更新助手")
         log_print("=" * 60)
@@ -316,155 +870,77 @@ class AppUpdater:
         set_status("正在等待主程序退出...")
         log_print("\n等待主程序完全退出...")
         
-        # 延长等待时间，确保主程序和所有子进程完全退出
-        for i in range(5, 0, -1):
-            log_print(f"  倒计时: {i} 秒...")
-            time.sleep(1)
-
-        if not update_path.exists():
-            raise FileNotFoundError(f"更新文件不存在: {update_path}")
-
-        if update_path.suffix.lower() == '.zip':
-            # === 步骤1: 移动所有文件到备份目录 ===
-            set_status("正在备份当前版本...")
-            log_print("\n[1/3] 正在移动所有文件到备份目录...")
-            backup_dir.mkdir(parents=True, exist_ok=True)
-
-            for item in list(app_dir.iterdir()):
-                # 跳过备份目录自身
-                if item.name == "backup":
-                    continue
-                try:
-                    dest = backup_dir / item.name
-                    item.rename(dest)
-                    log_print(f"  ✓ 已移动: {item.name}")
-                except Exception as e:
-                    log_print(f"  ✗ 移动失败 {item.name}: {e}")
-
-            # === 步骤2: 解压更新包到临时目录，并按 main.exe 定位源目录 ===
-            set_status("正在解压更新包...")
-            log_print("\n[2/3] 正在解压更新包到临时目录...")
-
-            # 更新包已被移动到 backup 中，从 backup 路径读取
-            moved_update = backup_dir / update_path.name
-            if not moved_update.exists():
-                # 如果更新包不在 backup 中（比如在 temp 目录），用原路径
-                moved_update = update_path
-
-            temp_extract = app_dir / "_update_temp"
-            if temp_extract.exists():
-                shutil.rmtree(temp_extract)
-            temp_extract.mkdir(exist_ok=True)
-
-            with zipfile.ZipFile(moved_update, 'r') as zip_ref:
-                zip_ref.extractall(temp_extract)
-            log_print("  ✓ 更新包已解压到临时目录")
-
-            main_exe_candidates = sorted(
-                temp_extract.rglob("main.exe"),
-                key=lambda p: len(p.parts)
-            )
-            if not main_exe_candidates:
-                raise FileNotFoundError("更新包中未找到 main.exe")
+        if parent_pid:
+            start = time.monotonic()
+            if _wait_for_process_exit(parent_pid, PARENT_EXIT_TIMEOUT, tick=set_status_tick):
+                log_print(f"  ✓ 主程序 (PID {parent_pid}) 已退出，用时 {time.monotonic() - start:.1f} 秒")
+            else:
+                log_print(f"  ✗ 等待主程序 (PID {parent_pid}) 退出超时，继续更新")
+        else:
+            # 旧版本启动的更新助手没有传入进程号，只能固定等待
+            for i in range(5, 0, -1):
+                log_print(f"  倒计时: {i} 秒...")
+                time.sleep(1)
 
-            source_dir = main_exe_candidates[0].parent
-            log_print(f"  ✓ 定位主程序目录: {source_dir}")
+        # 更新失败时（安装过程中出错的文件已还原）也要记录原因并重新启动当前版本，
+        # 否则更新助手直接退出，应用不会再启动
+        try:
+            if not update_path.exists():
+                raise FileNotFoundError(f"更新文件不存在: {update_path}")
 
-            set_status("正在安装更新...")
-            log_print("  → 正在复制更新文件到应用目录...")
-            for item in source_dir.iterdir():
-                dest = app_dir / item.name
-                try:
-                    if dest.exists():
-                        if dest.is_dir():
-                            shutil.rmtree(dest)
-                        else:
-                            dest.unlink()
-                    if item.is_dir():
-                        shutil.copytree(item, dest)
-                    else:
-                        shutil.copy2(item, dest)
-                    log_print(f"    ✓ 已复制: {item.name}")
-                except Exception as e:
-                    log_print(f"    ✗ 复制失败 {item.name}: {e}")
-
-            # === 步骤3: 从备份恢复用户数据目录 ===
-            set_status("正在恢复用户数据...")
-            log_print("\n[3/3] 正在从备份恢复用户数据...")
-            restore_dirs = ["app", "appData", "plugins", "tools"]
-            for dir_name in restore_dirs:
-                backup_item = backup_dir / dir_name
-                if not backup_item.exists():
-                    continue
-                dest_item = app_dir / dir_name
+            set_status("正在创建快照...")
+            log_print("\n[1/3] 正在创建当前版本的快照...")
+            backup_dir.mkdir(parents=True, exist_ok=True)
+            create_snapshot(app_dir, backup_dir, log_print)
+
+            if update_path.suffix.lower() == '.zip':
+                set_status("正在比较文件差异...")
+                log_print("\n[2/3] 正在比较已安装文件与更新包...")
+                apply_zip_update(update_path, app_dir, trash_dir, log_print, set_status)
+            elif update_path.suffix.lower() == '.exe':
+                # 单个 exe 文件的更新（简化版）
+                log_print("\n[2/3] 正在替换可执行文件...")
+                current_exe = app_dir / "main.exe"
+                moved = current_exe.exists()
+                if moved:
+                    _move_to_trash(app_dir, trash_dir, current_exe.name)
                 try:
-                    if backup_item.is_dir():
-                        if dest_item.exists():
-                            shutil.rmtree(dest_item)
-                        shutil.copytree(backup_item, dest_item)
-                    else:
-                        shutil.copy2(backup_item, dest_item)
-                    log_print(f"  ✓ 已恢复: {dir_name}")
-                except Exception as e:
-                    log_print(f"  ✗ 恢复失败 {dir_name}: {e}")
-
-            # 清理更新包
+                    shutil.copy2(update_path, current_exe)
+                except Exception:
+                    if moved:
+                        os.replace(trash_dir / current_exe.name, current_exe)
+                    raise
+                log_print(f"  ✓ 已更新: {current_exe.name}")
+
+            # 清理更新包和被替换的旧文件（正在运行的 exe 删除不了，下次启动时清理）
             set_status("正在清理临时文件...")
-            log_print("\n正在清理临时文件...")
-            shutil.rmtree(temp_extract, ignore_errors=True)
-            moved_update.unlink(missing_ok=True)
+            log_print("\n[3/3] 正在清理临时文件...")
             update_path.unlink(missing_ok=True)
+            shutil.rmtree(trash_dir, ignore_errors=True)
             log_print("  ✓ 临时文件已清理")
 
-        elif update_path.suffix.lower() == '.exe':
-            # 单个 exe 文件的更新（简化版）
-            log_print("\n[1/2] 正在备份当前可执行文件...")
-            backup_dir.mkdir(parents=True, exist_ok=True)
-
-            current_exe = app_dir / "main.exe"
-            if current_exe.exists():
-                backup_exe = backup_dir / "main.exe"
-                shutil.copy2(current_exe, backup_exe)
-                log_print(f"  ✓ 已备份: {current_exe.name}")
-
-            log_print("\n[2/2] 正在替换可执行文件...")
-            shutil.copy2(update_path, current_exe)
-            log_print(f"  ✓ 已更新: {current_exe.name}")
+            log_print("\n" + "=" * 60)
+            log_print("✓ 更新完成！")
+            log_print("=" * 60)
 
-            update_path.unlink(missing_ok=True)
+            # 清理旧快照，只保留最近几份
+            set_status("正在清理旧快照...")
+            log_print("\n正在清理旧快照...")
+            prune_snapshots(app_dir, log_print=log_print)
 
-        log_print("\n" + "=" * 60)
-        log_print("✓ 更新完成！")
-        log_print("=" * 60)
-
-        # 清理旧备份，只保留最近 3 份
-        set_status("正在清理旧备份...")
-        log_print("\n正在清理旧备份...")
-        backup_root = app_dir / "backup"
-        if backup_root.exists():
-            backups = sorted(
-                [d for d in backup_root.iterdir() if d.is_dir()],
-                key=lambda d: d.name
-            )
-            while len(backups) > 3:
-                oldest = backups.pop(0)
-                try:
-                    shutil.rmtree(oldest)
-                    log_print(f"  ✓ 已删除旧备份: {oldest.name}")
-                except Exception as e:
-                    log_print(f"  ✗ 删除旧备份失败 {oldest.name}: {e}")
+            set_status("更新完成，正在重启应用...")
+        except Exception as e:
+            log_print(f"\n✗ 更新失败: {e}")
+            log_print(traceback.format_exc())
+            set_status(f"更新失败，已还原当前版本，正在重启应用...\n{e}")
+            # 留出时间让用户看到失败提示
+            deadline = time.monotonic() + UPDATE_FAILED_DELAY
+            while time.monotonic() < deadline:
+                set_status_tick()
+                time.sleep(0.1)
 
-        set_status("更新完成，正在重启应用...")
         log_print("\n正在重启应用...")
-        time.sleep(2)
-
-        main_exe = app_dir / "main.exe"
-        if main_exe.exists():
-            os.startfile(str(main_exe))
-        else:
-            for exe in app_dir.glob("*.exe"):
-                os.startfile(str(exe))
-                break
+        _start_app(app_dir)
 
         try:
             if update_dialog is not None:
@@ -476,3 +952,45 @@ class AppUpdater:
             pass
     
 
+    @staticmethod
+    def rollback(timestamp: str):
+        """
+        回滚到 backup/<timestamp> 快照中的版本（由 --rollback <timestamp> 触发）
+        回滚前为当前版本也创建一份快照，回滚后可以再恢复回来
+        """
+        if not _is_packaged():
+            raise RuntimeError("⚠️ 安全保护：回滚功能仅在打包后的应用中可用")
+
+        app_dir = Path(sys.executable).parent
+        backup_root = app_dir / BACKUP_DIR
+        snapshots = sorted(d.name for d in backup_root.iterdir() if (d / SNAPSHOT_MANIFEST).exists()) \
+            if backup_root.exists() else []
+        if timestamp not in snapshots:
+            raise FileNotFoundError(f"未找到快照: {timestamp or '（未指定）'}，可用的快照: " + (", ".join(snapshots) or "无"))
+
+        now = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        log_dir = app_dir / "appData" / "log"
+        log_dir.mkdir(parents=True, exist_ok=True)
+        log_file = log_dir / f"rollback_{now}.txt"
+
+        def log_print(msg):
+            print(msg)
+            try:
+                with open(log_file, 'a', encoding='utf-8') as f:
+                    f.write(msg + '\n')
+            except:
+                pass
+
+        log_print(f"正在回滚到快照: {timestamp}")
+        current_dir = backup_root / now
+        current_dir.mkdir(parents=True, exist_ok=True)
+        create_snapshot(app_dir, current_dir, log_print)
+
+        trash_dir = app_dir / TRASH_DIR / now
+        restore_snapshot(app_dir, backup_root / timestamp, trash_dir, log_print)
+        shutil.rmtree(trash_dir, ignore_errors=True)
+        # 刚刚回滚到的快照可能是最旧的一份，不能被清理掉
+        prune_snapshots(app_dir, log_print=log_print, exclude={timestamp})
+
+        log_print("✓ 回滚完成，正在重启应用...")
+        _start_app(app_dir)
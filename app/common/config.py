@@ -5,7 +5,8 @@ from pathlib import Path
 import os
 from PyQt6.QtCore import QLocale
 from qfluentwidgets import (qconfig, QConfig, ConfigItem, OptionsConfigItem, BoolValidator,
-                            OptionsValidator, Theme, FolderValidator, ConfigSerializer)
+                            OptionsValidator, Theme, FolderValidator, ConfigSerializer,
+                            RangeConfigItem, RangeValidator)
 
 CONFIG_FOLDER = Path('AppData').absolute()
 CONFIG_FILE = CONFIG_FOLDER / "config.json"
@@ -45,6 +46,8 @@ class Config(QConfig):
     rememberMe = ConfigItem("Register", "RememberMe", True)
     email = ConfigItem("Register", "Email", "")
     password = ConfigItem("Register", "password", "")
+    # 验证通过后保存的 HMAC 令牌，凭据不变时再次登录无需重新验证
+    licenseToken = ConfigItem("Register", "LicenseToken", "")
 
     # main window
     micaEnabled = ConfigItem("MainWindow", "MicaEnabled", isWin11(), BoolValidator())
@@ -52,9 +55,19 @@ class Config(QConfig):
         "MainWindow", "DpiScale", "Auto", OptionsValidator([1, 1.25, 1.5, 1.75, 2, "Auto"]), restart=True)
     language = OptionsConfigItem(
         "MainWindow", "Language", QLocale.Language.Chinese, OptionsValidator(Language), LanguageSerializer(), restart=True)
+    # 后台标签页空闲多少分钟后休眠到磁盘缓存，0 表示不休眠
+    tabHibernateMinutes = RangeConfigItem("MainWindow", "TabHibernateMinutes", 30, RangeValidator(0, 1440))
 
     # software update
     checkUpdateAtStartUp = ConfigItem("Update", "CheckUpdateAtStartUp", True, BoolValidator())
+    # 下载缓存上限（MB），0 表示不缓存
+    downloadCacheSize = RangeConfigItem("Update", "DownloadCacheSize", 2048, RangeValidator(0, 102400))
+    # 下载应用更新包时的并发连接数
+    updateConnections = RangeConfigItem("Update", "UpdateConnections", 4, RangeValidator(1, 16))
+
+    # task engine
+    # 同时运行的插件任务数（解析工具等外部命令）
+    maxParallelTasks = RangeConfigItem("Task", "MaxParallelTasks", 2, RangeValidator(1, 16))
 
     rootPath = ConfigItem("RootPath", "RootPath", ROOTPATH, FolderValidator())
 
@@ -0,0 +1,202 @@
+# delta_update.py
+"""
+插件增量更新
+
+插件索引中的条目可以带 manifest_url，指向一个文件清单:
+    {"name": "...", "version": "...", "files": {"相对路径": "sha256", ...}}
+
+更新时只对比本地文件的 sha256，通过 HTTP Range 从插件 zip 中
+按需读取有变化的文件，不再下载整个压缩包。
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import zipfile
+
+from loguru import logger
+
+# 安装目录中记录当前已安装文件清单的文件名
+LOCAL_MANIFEST = ".manifest.json"
+# 每次 Range 请求最少读取的字节数，减少 zipfile 小块读取带来的请求次数
+RANGE_BLOCK_SIZE = 64 * 1024
+# 变化的数据超过整个压缩包的这个比例时，直接完整下载更快
+MAX_DELTA_RATIO = 0.5
+STAGING_DIR = ".delta-staging"
+
+
+class DeltaUnavailable(Exception):
+    """服务器或清单不支持增量更新，需要回退到完整下载"""
+
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def read_local_manifest(install_dir):
+    try:
+        with open(os.path.join(install_dir, LOCAL_MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except Exception:
+        return {}
+
+
+def write_local_manifest(install_dir, files):
+    path = os.path.join(install_dir, LOCAL_MANIFEST)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"files": files}, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def diff_manifest(remote_files, install_dir):
+    """返回 (需要更新的文件, 需要删除的文件)"""
+    changed = []
+    for name, digest in remote_files.items():
+        path = os.path.join(install_dir, name)
+        if not os.path.isfile(path) or sha256_file(path) != digest:
+            changed.append(name)
+
+    # 只删除上一次安装时清单中存在、新清单中已移除的文件，不动用户自己生成的文件
+    removed = [name for name in read_local_manifest(install_dir) if name not in remote_files]
+    return changed, removed
+
+
+class HttpRangeFile(io.RawIOBase):
+    """通过 Range 请求按需读取远程文件的只读文件对象，供 zipfile 使用"""
+
+    def __init__(self, session, url, timeout=(10, 30)):
+        super().__init__()
+        self.session = session
+        self.url = url
+        self.timeout = timeout
+        self.pos = 0
+        self.bytes_fetched = 0
+        self._cache_start = 0
+        self._cache = b""
+
+        resp = session.head(url, allow_redirects=True, timeout=timeout)
+        resp.raise_for_status()
+        self.url = resp.url
+        self.size = int(resp.headers.get("content-length", 0))
+        if not self.size or resp.headers.get("accept-ranges", "").lower() != "bytes":
+            raise DeltaUnavailable("服务器不支持 Range 请求")
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.pos = offset
+        elif whence == io.SEEK_CUR:
+            self.pos += offset
+        else:
+            self.pos = self.size + offset
+        return self.pos
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            n = self.size - self.pos
+        n = min(n, self.size - self.pos)
+        if n <= 0:
+            return b""
+
+        offset = self.pos - self._cache_start
+        if offset < 0 or offset + n > len(self._cache):
+            self._fill(self.pos, max(n, RANGE_BLOCK_SIZE))
+            offset = 0
+        data = self._cache[offset:offset + n]
+        self.pos += len(data)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def _fill(self, start, length):
+        end = min(start + length, self.size) - 1
+        resp = self.session.get(self.url, headers={"Range": "bytes={}-{}".format(start, end)}, timeout=self.timeout)
+        if resp.status_code != 206:
+            raise DeltaUnavailable("Range 请求返回 HTTP {}".format(resp.status_code))
+        self._cache_start = start
+        self._cache = resp.content
+        self.bytes_fetched += len(resp.content)
+
+
+def apply_delta(session, plugin, install_dir, progress=None):
+    """
+    增量更新已安装的插件，成功返回下载的字节数
+    任何不满足增量条件的情况都会抛出 DeltaUnavailable，由调用方回退到完整下载
+    """
+    manifest_url = plugin.get("manifest_url")
+    if not manifest_url or not os.path.isdir(install_dir):
+        raise DeltaUnavailable("插件没有提供文件清单或尚未安装")
+
+    resp = session.get(manifest_url, timeout=(10, 30))
+    resp.raise_for_status()
+    remote_files = resp.json().get("files", {})
+    if not remote_files:
+        raise DeltaUnavailable("文件清单为空")
+    for name in remote_files:
+        if os.path.isabs(name) or ".." in name.replace("\\", "/").split("/"):
+            raise DeltaUnavailable("文件清单中存在非法路径: {}".format(name))
+
+    changed, removed = diff_manifest(remote_files, install_dir)
+    logger.info("[插件下载器] 增量更新 {}: {} 个文件变化, {} 个文件删除", plugin["name"], len(changed), len(removed))
+
+    if not changed:
+        for name in removed:
+            path = os.path.join(install_dir, name)
+            if os.path.isfile(path):
+                os.remove(path)
+        write_local_manifest(install_dir, remote_files)
+        return 0
+
+    remote = HttpRangeFile(session, plugin["zip_url"])
+    staging = os.path.join(install_dir, STAGING_DIR)
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        with zipfile.ZipFile(remote) as zf:
+            try:
+                infos = [zf.getinfo(name) for name in changed]
+            except KeyError as e:
+                raise DeltaUnavailable("压缩包与文件清单不一致: {}".format(e))
+            if sum(i.compress_size for i in infos) > remote.size * MAX_DELTA_RATIO:
+                raise DeltaUnavailable("变化的文件过多")
+
+            # 先全部写入临时目录并校验，全部成功后才替换安装目录中的文件
+            for index, info in enumerate(infos, 1):
+                target = os.path.join(staging, info.filename)
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with zf.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                if sha256_file(target) != remote_files[info.filename]:
+                    raise ValueError("文件校验失败: {}".format(info.filename))
+                if progress:
+                    progress(int(index * 100 / len(infos)))
+
+        # metadata.json 最后替换：中途失败时版本号不变，下次仍会检测到更新
+        for name in sorted(changed, key=lambda n: n == "metadata.json"):
+            target = os.path.join(install_dir, name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(os.path.join(staging, name), target)
+        for name in removed:
+            path = os.path.join(install_dir, name)
+            if os.path.isfile(path):
+                os.remove(path)
+        write_local_manifest(install_dir, remote_files)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return remote.bytes_fetched
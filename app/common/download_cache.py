@@ -0,0 +1,159 @@
+# coding: utf-8
+"""
+下载缓存
+插件包和应用更新包按 SHA-256 存放在本地，超出容量时按最近使用时间淘汰。
+缓存位于应用目录之外，更新应用时不会被备份/复制。
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+from loguru import logger
+
+from .config import cfg
+
+CACHE_DIR = os.path.join(
+    os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "OneMore", "download_cache"
+)
+
+
+class HashMismatch(Exception):
+    """下载内容与期望的 SHA-256 不一致"""
+
+
+class DownloadCache:
+    """ Content-addressed download cache """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        return cfg.get(cfg.downloadCacheSize) * 1024 * 1024
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {"entries": {}, "aliases": {}}
+
+    def _save_index(self, index: dict):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.index_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=1)
+        os.replace(self.index_path + ".tmp", self.index_path)
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.cache_dir, sha256[:2], sha256)
+
+    def lookup(self, sha256: str = None, alias: str = None):
+        """
+        查找缓存，返回文件路径或 None
+        sha256: 期望的文件哈希；未知时可用 alias（如 "url#版本"）查找上次下载的结果
+        """
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            index = self._load_index()
+            sha256 = (sha256 or index["aliases"].get(alias or "", "")).lower()
+            entry = index["entries"].get(sha256)
+            path = self._path(sha256) if sha256 else ""
+            if entry is None or not os.path.isfile(path) or os.path.getsize(path) != entry["size"]:
+                return None
+            entry["last_used"] = time.time()
+            self._save_index(index)
+        logger.info("[下载缓存] 命中缓存: {}", sha256)
+        return path
+
+    def store(self, src_path: str, sha256: str, alias: str = None):
+        """
+        把已校验的文件移入缓存，返回缓存中的路径
+        缓存被禁用或移动失败时返回 None，文件留在 src_path，调用方直接使用原文件
+        """
+        if self.max_size <= 0:
+            return None
+        sha256 = sha256.lower()
+        with self._lock:
+            index = self._load_index()
+            path = self._path(sha256)
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # 缓存目录和下载目录可能不在同一个磁盘上，os.replace 会失败，shutil.move 改为复制后删除
+                shutil.move(src_path, path)
+            except OSError as e:
+                logger.warning("[下载缓存] 文件存入缓存失败，跳过缓存: {}", e)
+                # 复制到一半失败时删除不完整的缓存文件
+                if os.path.exists(src_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                return None
+            index["entries"][sha256] = {"size": os.path.getsize(path), "last_used": time.time()}
+            if alias:
+                index["aliases"][alias] = sha256
+            self._evict(index, keep=sha256)
+            self._save_index(index)
+        return path
+
+    def remove(self, sha256: str):
+        with self._lock:
+            index = self._load_index()
+            self._drop(index, sha256.lower())
+            self._save_index(index)
+
+    def _drop(self, index: dict, sha256: str):
+        index["entries"].pop(sha256, None)
+        for alias in [a for a, s in index["aliases"].items() if s == sha256]:
+            del index["aliases"][alias]
+        try:
+            os.remove(self._path(sha256))
+        except OSError:
+            pass
+
+    def _evict(self, index: dict, keep: str):
+        """按最近使用时间淘汰，直到总大小不超过上限"""
+        total = sum(e["size"] for e in index["entries"].values())
+        for sha256, entry in sorted(index["entries"].items(), key=lambda i: i[1]["last_used"]):
+            if total <= self.max_size:
+                break
+            if sha256 == keep:
+                continue
+            total -= entry["size"]
+            self._drop(index, sha256)
+            logger.info("[下载缓存] 淘汰缓存: {}", sha256)
+
+    @staticmethod
+    def materialize(cached_path: str, dest_path: str):
+        """把缓存文件放到 dest_path（优先硬链接），供会删除或移动文件的调用方使用"""
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        try:
+            os.link(cached_path, dest_path)
+        except OSError:
+            shutil.copy2(cached_path, dest_path)
+        return dest_path
+
+
+def sha256_of(path: str, hasher=None):
+    """计算文件的 SHA-256，传入 hasher 时在其基础上继续（用于断点续传）"""
+    hasher = hasher or hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher
+
+
+def verify(sha256_hex: str, expected: str = None):
+    if expected and sha256_hex.lower() != expected.lower():
+        raise HashMismatch("SHA-256 校验失败: 期望 {}，实际 {}".format(expected, sha256_hex))
+
+
+downloadCache = DownloadCache()
@@ -1,5 +1,18 @@
 # coding: utf-8
+import hashlib
+import hmac
+import os
+import secrets
+
 import bcrypt
+from PyQt6.QtCore import QThread, pyqtSignal
+from loguru import logger
+
+from .config import ROOTPATH
+from .startup_profiler import startupProfiler
+
+# 计算验证令牌使用的本机密钥，首次使用时随机生成
+TOKEN_KEY_FILE = os.path.join(ROOTPATH, "appData", "license.key")
 
 
 class LicenseService:
@@ -12,5 +25,65 @@ class LicenseService:
         """ Verify if the activation code is legal """
         # TODO: ADD YOUR VALIDATE LOGIC HERE
 
-        return bcrypt.checkpw(email.encode(), self.hashed_email) and bcrypt.checkpw(license.encode(), self.hashed_license)
+        with startupProfiler.span("LicenseService.validate (bcrypt)"):
+            return bcrypt.checkpw(email.encode(), self.hashed_email) and bcrypt.checkpw(license.encode(), self.hashed_license)
+
+    def token(self, license: str, email: str) -> str:
+        """ 凭据的验证令牌，凭据或授权哈希变化时令牌随之变化 """
+        message = b"\0".join([email.encode(), license.encode(), self.hashed_email, self.hashed_license])
+        return hmac.new(self._token_key(), message, hashlib.sha256).hexdigest()
+
+    def check_token(self, token: str, license: str, email: str) -> bool:
+        """ 令牌与凭据匹配时说明这组凭据之前已通过 bcrypt 验证 """
+        if not token:
+            return False
+        try:
+            return hmac.compare_digest(token, self.token(license, email))
+        except OSError:
+            return False
+
+    @staticmethod
+    def _token_key() -> bytes:
+        try:
+            with open(TOKEN_KEY_FILE, "rb") as f:
+                key = f.read()
+            if len(key) >= 32:
+                return key
+        except FileNotFoundError:
+            pass
+        key = secrets.token_bytes(32)
+        os.makedirs(os.path.dirname(TOKEN_KEY_FILE), exist_ok=True)
+        with open(TOKEN_KEY_FILE, "wb") as f:
+            f.write(key)
+        return key
+
+
+class LicenseValidator(QThread):
+    """ 在后台线程中执行 bcrypt 验证 """
+
+    # 信号：(是否验证通过, 通过时的验证令牌)
+    validateFinished = pyqtSignal(bool, str)
+
+    def __init__(self, service: LicenseService, license: str, email: str, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.license = license
+        self.email = email
+
+    def run(self):
+        try:
+            ok = self.service.validate(self.license, self.email)
+        except Exception:
+            self.validateFinished.emit(False, "")
+            return
+        if not ok:
+            self.validateFinished.emit(False, "")
+            return
 
+        # 令牌只用于下次登录跳过 bcrypt，生成失败（例如密钥文件无法写入）不影响本次登录
+        try:
+            token = self.service.token(self.license, self.email)
+        except Exception as e:
+            logger.warning(f"生成登录令牌失败: {e}")
+            token = ""
+        self.validateFinished.emit(True, token)
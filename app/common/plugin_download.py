@@ -0,0 +1,241 @@
+# plugin_download.py
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+import requests, zipfile, os, json, time, tempfile, hashlib
+from loguru import logger
+
+from .download_cache import downloadCache, sha256_of, verify
+from .zip_extract import extract_zip
+from .delta_update import apply_delta, write_local_manifest
+
+# 下载分块大小、进度信号最小间隔（秒，即最多 20 次/秒）、断线重试次数
+CHUNK_SIZE = 256 * 1024
+PROGRESS_INTERVAL = 0.05
+MAX_RETRIES = 3
+# (连接超时, 读取超时)
+TIMEOUT = (10, 30)
+
+DOWNLOAD_DIR = os.path.join(tempfile.gettempdir(), "onemore_plugins")
+
+
+class DownloadExtractThread(QThread):
+    progressChanged = pyqtSignal(int)
+    # 信号：解压进度百分比
+    extractProgressChanged = pyqtSignal(int)
+    installSuccess = pyqtSignal(dict)
+    installFailed = pyqtSignal(str)
+
+    def __init__(self, plugin, plugin_dir, session=None):
+        super().__init__()
+        self.plugin = plugin
+        self.plugin_dir = plugin_dir
+        # 由 InstallScheduler 传入共享的 Session 以复用连接
+        self.session = session or requests
+        self._last_emit = 0.0
+
+    def run(self):
+        try:
+            name = self.plugin["name"]
+            zip_url = self.plugin["zip_url"]
+
+            # 当插件名为Base_Tools时，安装路径要变为根目录，此时传入的self.plugin_dir是plugins目录
+
+            path = os.path.join(self.plugin_dir, name)
+
+            logger.info("[插件下载器] 开始安装插件: {}".format(name))
+            logger.info("[插件下载器] 插件下载地址: {}".format(zip_url))
+            logger.info("[插件下载器] 插件安装路径: {}".format(path))
+
+            # 已安装且索引提供了文件清单时，只下载有变化的文件
+            if os.path.isdir(path) and self.plugin.get("manifest_url"):
+                try:
+                    fetched = apply_delta(self.session, self.plugin, path,
+                                          progress=lambda p: self._emit_progress(p, 100))
+                    logger.info("[插件下载器] 增量更新完成: {}，下载 {} 字节".format(name, fetched))
+                    self.installSuccess.emit(self.plugin)
+                    return
+                except Exception as e:
+                    logger.warning("[插件下载器] 增量更新不可用，改为完整下载: {}".format(e))
+
+            # 先查本地缓存：索引提供 sha256 时按哈希查找，否则按 "下载地址#版本" 查找
+            expected = self.plugin.get("sha256")
+            alias = "{}#{}".format(zip_url, self.plugin.get("version", ""))
+            archive = downloadCache.lookup(expected, alias)
+            part_path = ""
+            if archive is None:
+                # 下载到临时文件，同一插件同一版本的未完成下载可断点续传
+                os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+                part_path = os.path.join(DOWNLOAD_DIR, "{}-{}.zip.part".format(name, self.plugin.get("version", "")))
+                digest = self._download(zip_url, part_path)
+                try:
+                    verify(digest, expected)
+                except Exception:
+                    self._remove_partial(part_path)
+                    raise
+                archive = downloadCache.store(part_path, digest, alias) or part_path
+            else:
+                self._emit_progress(1, 1, force=True)
+
+            # 多线程解压
+            try:
+                names = extract_zip(archive, path, progress=self._emit_extract_progress)
+            except zipfile.BadZipFile:
+                # 损坏的压缩包从缓存中删除，下次重新完整下载
+                if archive != part_path:
+                    downloadCache.remove(os.path.basename(archive))
+                raise
+            finally:
+                if part_path:
+                    self._remove_partial(part_path)
+
+            # 记录已安装的文件列表，供之后的增量更新判断哪些文件已被移除（哈希在更新时重新计算）
+            try:
+                write_local_manifest(path, {n: "" for n in names if not n.endswith("/")})
+            except Exception as e:
+                logger.warning("[插件下载器] 写入文件清单失败: {}".format(e))
+
+            # # 如果安装的插件是Base_Tools，则更名为tool
+            # if name == "Base_Tools":
+            #     os.rename(path, os.path.join(self.plugin_dir, "tools"))
+
+            self.installSuccess.emit(self.plugin)
+        except Exception as e:
+            self.installFailed.emit(str(e))
+
+    def _download(self, url, part_path):
+        """流式下载到 part_path，连接中断时使用 Range 请求续传，返回文件的 SHA-256"""
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                return self._download_once(url, part_path).hexdigest()
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.warning("[插件下载器] 下载中断，第 {} 次重试: {}", attempt, e)
+                time.sleep(attempt)
+
+    def _download_once(self, url, part_path):
+        state_path = part_path + ".json"
+        downloaded = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = ""
+        if downloaded and os.path.exists(state_path):
+            with open(state_path, "r", encoding="utf-8") as f:
+                validator = json.load(f).get("validator", "")
+
+        headers = {}
+        if downloaded and validator:
+            # 服务器文件变化时 If-Range 会让服务器返回完整的 200
+            headers["Range"] = "bytes={}-".format(downloaded)
+            headers["If-Range"] = validator
+
+        with self.session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as resp:
+            if resp.status_code == 416:
+                # 上次已经完整下载
+                self._emit_progress(downloaded, downloaded, force=True)
+                return sha256_of(part_path)
+            resp.raise_for_status()
+            length = int(resp.headers.get("content-length", 0))
+            if resp.status_code == 206:
+                logger.info("[插件下载器] 从 {} 字节处继续下载", downloaded)
+                total = downloaded + length if length else 0
+                mode = "ab"
+                # 续传时先把已下载的部分计入哈希
+                hasher = sha256_of(part_path)
+            else:
+                downloaded = 0
+                total = length
+                mode = "wb"
+                hasher = hashlib.sha256()
+                with open(state_path, "w", encoding="utf-8") as f:
+                    json.dump({"validator": resp.headers.get("ETag") or resp.headers.get("Last-Modified", "")}, f)
+
+            with open(part_path, mode) as f:
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    f.write(chunk)
+                    hasher.update(chunk)
+                    downloaded += len(chunk)
+                    self._emit_progress(downloaded, total)
+
+        if total and downloaded < total:
+            raise requests.ConnectionError("下载不完整: {}/{}".format(downloaded, total))
+        self._emit_progress(downloaded, total, force=True)
+        return hasher
+
+    def _emit_progress(self, downloaded, total, force=False):
+        # 没有 content-length 时无法计算百分比
+        if not total:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_emit < PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        self.progressChanged.emit(min(int(downloaded * 100 / total), 100))
+
+    def _emit_extract_progress(self, done, total):
+        now = time.monotonic()
+        if done < total and now - self._last_emit < PROGRESS_INTERVAL:
+            return
+        self._last_emit = now
+        self.extractProgressChanged.emit(int(done * 100 / total) if total else 100)
+
+    @staticmethod
+    def _remove_partial(part_path):
+        for p in (part_path, part_path + ".json"):
+            if os.path.exists(p):
+                os.remove(p)
+
+
+class InstallScheduler(QObject):
+    """插件安装队列：限制同时下载的数量，所有下载共用一个带连接池的 Session"""
+
+    # 信号：(插件名, 百分比)
+    progressChanged = pyqtSignal(str, int)
+    # 信号：(插件名, 解压百分比)
+    extractProgressChanged = pyqtSignal(str, int)
+    installSuccess = pyqtSignal(dict)
+    # 信号：(插件名, 错误信息)
+    installFailed = pyqtSignal(str, str)
+    # 队列中所有任务都已结束
+    queueFinished = pyqtSignal()
+
+    def __init__(self, max_workers=3, parent=None):
+        super().__init__(parent)
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._pending = []
+        self._running = {}
+
+    def is_queued(self, name):
+        return name in self._running or any(p["name"] == name for p, _ in self._pending)
+
+    def submit(self, plugin, plugin_dir):
+        """加入安装队列，同名插件已在队列中时忽略，返回是否加入"""
+        if self.is_queued(plugin["name"]):
+            return False
+        self._pending.append((plugin, plugin_dir))
+        self._schedule()
+        return True
+
+    def _schedule(self):
+        while self._pending and len(self._running) < self.max_workers:
+            plugin, plugin_dir = self._pending.pop(0)
+            name = plugin["name"]
+            thread = DownloadExtractThread(plugin, plugin_dir, session=self.session)
+            thread.progressChanged.connect(lambda p, n=name: self.progressChanged.emit(n, p))
+            thread.extractProgressChanged.connect(lambda p, n=name: self.extractProgressChanged.emit(n, p))
+            thread.installSuccess.connect(self.installSuccess)
+            thread.installFailed.connect(lambda err, n=name: self.installFailed.emit(n, err))
+            thread.finished.connect(lambda n=name: self._on_finished(n))
+            self._running[name] = thread
+            thread.start()
+
+    def _on_finished(self, name):
+        thread = self._running.pop(name, None)
+        if thread is not None:
+            thread.deleteLater()
+        self._schedule()
+        if not self._running and not self._pending:
+            self.queueFinished.emit()
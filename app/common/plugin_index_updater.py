@@ -0,0 +1,100 @@
+# coding: utf-8
+"""
+插件市场索引后台更新
+使用 ETag / Last-Modified 条件请求，索引未变化时只需一次 304
+只更新插件索引和插件图标；旧版本的 plugins.zip 中还带有插件管理器的 .py 文件，
+这些文件不再解压，不会覆盖程序正在使用的代码
+"""
+import io
+import json
+import os
+import zipfile
+
+import requests
+from PyQt6.QtCore import QThread, pyqtSignal
+from loguru import logger
+
+from .config import ROOTPATH
+
+PLUGIN_DIR = os.path.join(ROOTPATH, 'plugins')
+PLUGINS_ZIP_URL = "https://raw.githubusercontent.com/miniLQ/onemore/refs/heads/master/release/plugins.zip"
+# 记录上一次下载的 ETag / Last-Modified
+STATE_FILE = os.path.join(ROOTPATH, "appData", "plugin_index_state.json")
+# plugins.zip 中需要更新的内容
+INDEX_FILE = "plugin_index.json"
+RESOURCE_DIR = "plugin_resources/"
+
+
+def _load_state() -> dict:
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def _save_state(state: dict):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    with open(STATE_FILE, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+
+
+class PluginIndexUpdater(QThread):
+    """下载 plugins.zip 并更新插件索引和图标的线程"""
+
+    # 信号：(索引是否有变化)
+    updateFinished = pyqtSignal(bool)
+    updateError = pyqtSignal(str)
+
+    def __init__(self, url: str = PLUGINS_ZIP_URL, parent=None):
+        super().__init__(parent)
+        self.url = url
+
+    def run(self):
+        try:
+            os.makedirs(PLUGIN_DIR, exist_ok=True)
+
+            headers = {}
+            state = _load_state()
+            # 本地索引丢失时强制完整下载
+            if os.path.exists(os.path.join(PLUGIN_DIR, "plugin_index.json")):
+                if state.get("etag"):
+                    headers["If-None-Match"] = state["etag"]
+                if state.get("last_modified"):
+                    headers["If-Modified-Since"] = state["last_modified"]
+
+            logger.info("[插件管理器] 正在从 {} 检查插件市场更新", self.url)
+            resp = requests.get(self.url, headers=headers, stream=True, timeout=5)
+            if resp.status_code == 304:
+                logger.info("[插件管理器] 插件市场已是最新")
+                self.updateFinished.emit(False)
+                return
+            resp.raise_for_status()
+
+            buf = io.BytesIO()
+            for chunk in resp.iter_content(64 * 1024):
+                buf.write(chunk)
+            logger.success("[插件管理器] 插件索引已下载")
+
+            buf.seek(0)
+            with zipfile.ZipFile(buf) as zf:
+                names = zf.namelist()
+                if INDEX_FILE not in names:
+                    raise ValueError("plugins.zip 中没有 {}".format(INDEX_FILE))
+                zf.extractall(PLUGIN_DIR, [n for n in names if n.startswith(RESOURCE_DIR) and ".." not in n.split("/")])
+                # 插件市场可能正在读取索引，先写入临时文件再替换
+                index_path = os.path.join(PLUGIN_DIR, INDEX_FILE)
+                with open(index_path + ".tmp", "wb") as f:
+                    f.write(zf.read(INDEX_FILE))
+                os.replace(index_path + ".tmp", index_path)
+            logger.success("[插件管理器] 插件索引已更新")
+
+            # 解压成功后再记录校验信息，避免半途失败后一直返回 304
+            _save_state({
+                "etag": resp.headers.get("ETag", ""),
+                "last_modified": resp.headers.get("Last-Modified", ""),
+            })
+            self.updateFinished.emit(True)
+        except Exception as e:
+            logger.error("[插件管理器] 插件市场更新失败: {}", e)
+            self.updateError.emit(str(e))
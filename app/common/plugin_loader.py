@@ -0,0 +1,160 @@
+import os
+import importlib.util
+import json
+from loguru import logger
+
+from .config import ROOTPATH
+from .startup_profiler import startupProfiler
+
+# 插件安装目录；加载插件的代码随主程序发布，不放在这个会被插件索引包覆盖的目录中
+PLUGIN_DIR = os.path.join(ROOTPATH, "plugins")
+INDEX_PATH = os.path.join(PLUGIN_DIR, "plugin_index.json")
+
+# metadata.json 中 card.category 与主窗口界面的对应关系
+CARD_CATEGORIES = {
+    "general": "generalInterface",
+    "mtk": "mtkInterface",
+    "qcom": "qcomInterface",
+}
+
+#logger.info(PLUGIN_DIR)
+
+def read_metadata(plugin_path):
+    """读取插件目录下的 metadata.json，不存在或格式错误时返回 None"""
+    meta_path = os.path.join(plugin_path, "metadata.json")
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"[插件管理器] 读取插件清单失败 {meta_path}: {e}")
+        return None
+
+
+def read_index_cards():
+    """插件索引中各插件的 card 声明: {插件名: (版本号, card)}"""
+    try:
+        with open(INDEX_PATH, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except Exception:
+        return {}
+    return {p["name"]: (p.get("version"), p["card"]) for p in index
+            if isinstance(p, dict) and "name" in p and isinstance(p.get("card"), dict)}
+
+
+def import_plugin(name, entry_path):
+    """动态加载 plugin.py 并返回模块对象"""
+    spec = importlib.util.spec_from_file_location(f"{name}_plugin", entry_path)
+    if not spec or not spec.loader:
+        return None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def register_plugin(main_window, name, entry_path):
+    """导入插件并调用其 register(main_window)，成功返回 True"""
+    try:
+        with startupProfiler.span(f"import plugin {name}"):
+            module = import_plugin(name, entry_path)
+        if module is None:
+            return False
+        if hasattr(module, "register"):
+            with startupProfiler.span(f"plugin {name} register()"):
+                module.register(main_window)
+            logger.info(f"[插件管理器] 加载插件: {name}")
+            return True
+    except Exception as e:
+        logger.error(f"[插件管理器] 加载插件失败 {name}: {e}")
+    return False
+
+
+def register_lazy_plugin(main_window, name, plugin_path, entry_path, card):
+    """
+    仅根据 metadata.json（或插件索引）中的 card 声明注册卡片，插件模块在卡片第一次被打开时才导入
+
+    card 字段:
+        title:       卡片标题
+        category:    general / mtk / qcom
+        icon:        图标文件（相对插件目录），默认 logo.png
+        unique_name: 插件注册时使用的 UNIQUE_NAME，默认与 title 相同
+        content:     卡片副标题，默认 "@designed by <author>."
+    """
+    title = card.get("title")
+    category = card.get("category", "general")
+    interface = getattr(main_window, CARD_CATEGORIES.get(category, ""), None)
+    if not title or interface is None:
+        return False
+
+    unique_name = card.get("unique_name", title)
+    icon = os.path.join(plugin_path, card.get("icon", "logo.png"))
+    content = card.get("content", "@designed by {}.".format(card.get("author", "iliuqi")))
+
+    def lazy_open():
+        # 插件的 register 会用真正的打开函数覆盖 pluginOpenerMap 中的 lazy_open
+        if not register_plugin(main_window, name, entry_path):
+            return
+        opener = main_window.pluginOpenerMap.get(unique_name)
+        if opener is None or opener is lazy_open:
+            logger.error(f"[插件管理器] 插件 {name} 未注册打开函数: {unique_name}")
+            return
+        opener()
+
+    interface.addCard(icon, title, content, unique_name)
+    main_window.registerPluginOpener(unique_name, lazy_open)
+    logger.info(f"[插件管理器] 注册插件卡片: {name}")
+    return True
+
+
+def load_plugin(main_window, name, plugin_path, index_cards=None):
+    # 检查是否存在__init__.py 文件，如果不存在新建空文件
+    init_path = os.path.join(plugin_path, "__init__.py")
+    if not os.path.exists(init_path):
+        with open(init_path, "w", encoding="utf-8") as f:
+            f.write("# This is an empty __init__.py file for plugin {}".format(name))
+
+    metadata = read_metadata(plugin_path) or {}
+    entry_path = os.path.join(plugin_path, metadata.get("entry", "plugin.py"))
+    if not os.path.exists(entry_path):
+        return
+
+    # 声明了 card 的插件按需加载，否则保持原有的启动时加载
+    # 已发布的旧版本插件包中没有 card，版本号与索引一致时使用插件索引中的声明
+    card = metadata.get("card")
+    if not isinstance(card, dict) and index_cards and name in index_cards:
+        version, index_card = index_cards[name]
+        if version and version == metadata.get("version"):
+            card = dict(index_card)
+    if isinstance(card, dict):
+        card.setdefault("author", metadata.get("author", "iliuqi"))
+        if register_lazy_plugin(main_window, name, plugin_path, entry_path, card):
+            return
+        logger.warning(f"[插件管理器] 插件 {name} 的 card 声明无效，改为直接加载")
+
+    register_plugin(main_window, name, entry_path)
+
+
+def iter_load_plugins(main_window):
+    """逐个加载插件，每加载完一个插件 yield 一次插件名，调用方可以在两个插件之间处理界面事件"""
+    #logger.info("Loading plugins")
+    plugin_root = os.path.join(PLUGIN_DIR)
+    if not os.path.exists(plugin_root):
+        return
+
+    index_cards = read_index_cards()
+    for name in os.listdir(plugin_root):
+        plugin_path = os.path.join(plugin_root, name)
+        # 跳过插件资源目录
+        if "plugin_resources" in plugin_path:
+            continue
+        if not os.path.isdir(plugin_path):
+            continue
+
+        load_plugin(main_window, name, plugin_path, index_cards)
+        yield name
+
+
+def load_plugins(main_window):
+    for _ in iter_load_plugins(main_window):
+        pass
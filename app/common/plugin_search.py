@@ -0,0 +1,128 @@
+# plugin_search.py
+"""
+插件市场搜索索引
+对名称、描述、作者和标签建立倒排索引，支持词前缀、子串和拼写容错匹配，并按相关度排序。
+中文按相邻两字切分，英文按单词和下划线/驼峰切分。
+"""
+import bisect
+import re
+
+# 字段权重：名称 > 标签 > 作者 > 描述
+FIELD_WEIGHTS = {"name": 4.0, "tags": 3.0, "author": 2.0, "description": 1.0}
+# 匹配方式得分系数
+EXACT, PREFIX, SUBSTRING, FUZZY = 3.0, 2.0, 1.0, 0.5
+
+_WORD_RE = re.compile(r"[a-z0-9]+|[一-鿿]+")
+_CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def _is_cjk(token):
+    return "一" <= token[0] <= "鿿"
+
+
+def tokenize(text):
+    """把文本切分成索引词"""
+    if not text:
+        return []
+    text = _CAMEL_RE.sub(" ", text).lower()
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        if _is_cjk(word):
+            # 中文没有空格分词，使用单字和二元组
+            tokens.extend(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def _within_distance(a, b, limit):
+    """a、b 的编辑距离是否不超过 limit"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return False
+        prev = cur
+    return prev[-1] <= limit
+
+
+class PluginSearchIndex:
+    """ Inverted index over the plugin list """
+
+    def __init__(self, plugins=()):
+        self.build(plugins)
+
+    def build(self, plugins):
+        # token -> {行号: 该词在此插件中的最大字段权重}
+        self._postings = {}
+        for row, plugin in enumerate(plugins):
+            fields = {
+                "name": plugin.get("name", ""),
+                "description": plugin.get("description", ""),
+                "author": plugin.get("author", ""),
+                "tags": " ".join(plugin.get("tags", [])),
+            }
+            for field, text in fields.items():
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    rows = self._postings.setdefault(token, {})
+                    rows[row] = max(rows.get(row, 0.0), weight)
+        self._vocab = sorted(self._postings)
+
+    def _match_term(self, term):
+        """返回 {行号: 得分}，该查询词在所有插件上的最佳匹配"""
+        scores = {}
+
+        def add(token, factor):
+            for row, weight in self._postings[token].items():
+                scores[row] = max(scores.get(row, 0.0), weight * factor)
+
+        if term in self._postings:
+            add(term, EXACT)
+
+        # 前缀：在有序词表上二分查找
+        start = bisect.bisect_left(self._vocab, term)
+        for token in self._vocab[start:]:
+            if not token.startswith(term):
+                break
+            if token != term:
+                add(token, PREFIX)
+
+        # 子串和拼写容错只对较长的英文查询词生效，避免短词匹配过多
+        if len(term) >= 3 and not _is_cjk(term):
+            for token in self._vocab:
+                if term in token and not token.startswith(term):
+                    add(token, SUBSTRING)
+
+            # 没有任何匹配时才做拼写容错
+            if not scores:
+                limit = 1 if len(term) < 6 else 2
+                for token in self._vocab:
+                    if _within_distance(term, token, limit):
+                        add(token, FUZZY)
+        return scores
+
+    def search(self, query):
+        """
+        返回 {行号: 得分}；查询为空时返回 None 表示不过滤
+        所有查询词都必须匹配
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        result = None
+        for term in dict.fromkeys(terms):
+            scores = self._match_term(term)
+            if result is None:
+                result = scores
+            else:
+                result = {row: result[row] + score for row, score in scores.items() if row in result}
+            if not result:
+                return {}
+        return result
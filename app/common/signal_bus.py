@@ -4,6 +4,7 @@ import requests
 import os,io
 from loguru import logger
 from app.common.config import ROOTPATH
+from app.common.plugin_index_updater import PluginIndexUpdater
 import zipfile
 
 from qfluentwidgets import (
@@ -20,9 +21,11 @@ class SignalBus(QObject):
     checkUpdateSig = pyqtSignal()
     checkAppUpdateSig = pyqtSignal()  # 检查应用程序更新信号
     micaEnableChanged = pyqtSignal(bool)
+    pluginIndexUpdated = pyqtSignal()  # 插件市场索引已在后台更新
 
     def __init__(self):
         super().__init__()
+        self._indexUpdater = None
 
         # 连接信号到槽函数
         self.checkUpdateSig.connect(self.Update)
@@ -97,34 +100,38 @@ class SignalBus(QObject):
         #     logger.error(e)
 
         logger.info("[插件管理器] 正在更新插件管理器...")
-        # 从这个地址下载https://raw.githubusercontent.com/miniLQ/onemore/refs/heads/dev/plugins/plugin_index.json
-        logger.info("[插件管理器] 正在从 https://raw.githubusercontent.com/miniLQ/onemore/refs/heads/master/release/plugins.zip 下载文件")
-        if not os.path.exists(PLUGIN_DIR):
-            os.makedirs(PLUGIN_DIR)
-        try:
-            resp = requests.get("https://raw.githubusercontent.com/miniLQ/onemore/refs/heads/master/release/plugins.zip", stream=True, timeout=5)
-            buf = io.BytesIO()
+        # 在后台线程下载，避免阻塞界面；索引有变化时通过 pluginIndexUpdated 通知插件市场刷新
+        if self._indexUpdater is not None and self._indexUpdater.isRunning():
+            return
+
+        self._indexUpdater = PluginIndexUpdater()
+        self._indexUpdater.updateFinished.connect(lambda changed: self._onIndexUpdateFinished(changed, auto))
+        self._indexUpdater.updateError.connect(lambda msg: self._onIndexUpdateError(msg, auto))
+        self._indexUpdater.start()
 
-            for chunk in resp.iter_content(1024):
-                buf.write(chunk)
-            logger.success("[插件管理器] 插件市场模块已下载")
-            # 解压
-            buf.seek(0)
-            with zipfile.ZipFile(buf) as zf:
-                zf.extractall(PLUGIN_DIR)
-            logger.success("[插件管理器] 插件市场模块已解压")
-        except Exception as e:
-            logger.error(e)
+    def _onIndexUpdateFinished(self, changed, auto):
+        if changed:
+            self.pluginIndexUpdated.emit()
 
         if auto == False:
             InfoBar.success(
                 parent=None,
                 title="更新成功",
-                content=f"插件市场已更新，请重启软件以生效",
+                content="插件市场已更新，插件列表已刷新" if changed else "插件市场已是最新",
                 position=InfoBarPosition.TOP,
                 duration=10000,
                 isClosable=False
             )
 
+    def _onIndexUpdateError(self, error, auto):
+        if auto == False:
+            InfoBar.error(
+                parent=None,
+                title="更新失败",
+                content=error,
+                position=InfoBarPosition.TOP,
+                duration=10000,
+                isClosable=True
+            )
 
 signalBus = SignalBus()
\ No newline at end of file
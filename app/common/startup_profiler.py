@@ -0,0 +1,91 @@
+# coding: utf-8
+"""
+启动耗时分析
+使用 --profile-startup 启动时，记录各启动阶段的耗时，
+输出 Chrome trace（chrome://tracing 或 Perfetto 打开）和汇总表到 appData/log
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """ Startup timeline profiler """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._depth = threading.local()
+        self._stamp = time.strftime("%Y-%m-%d-%H%M%S")
+
+    def enable(self):
+        self.enabled = True
+
+    @contextmanager
+    def span(self, name: str):
+        """记录一个阶段，未启用时不做任何事"""
+        if not self.enabled:
+            yield
+            return
+
+        depth = getattr(self._depth, "value", 0)
+        self._depth.value = depth + 1
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._depth.value = depth
+            self.events.append({
+                "name": name,
+                "start": (start - self._origin) // 1000,
+                "dur": (end - start) // 1000,
+                "tid": threading.get_ident(),
+                "depth": depth,
+            })
+
+    def save(self, log_dir: str = None):
+        """写出 trace json 和汇总表，返回 (trace路径, 汇总路径)；未启用时返回 None"""
+        if not self.enabled:
+            return None
+
+        if log_dir is None:
+            from .config import ROOTPATH
+            log_dir = os.path.join(ROOTPATH, "appData", "log")
+        os.makedirs(log_dir, exist_ok=True)
+
+        trace_path = os.path.join(log_dir, f"startup_{self._stamp}.json")
+        summary_path = os.path.join(log_dir, f"startup_{self._stamp}.txt")
+
+        events = sorted(self.events, key=lambda e: (e["start"], e["depth"]))
+        trace = {
+            "traceEvents": [
+                {
+                    "name": e["name"],
+                    "cat": "startup",
+                    "ph": "X",
+                    "ts": e["start"],
+                    "dur": e["dur"],
+                    "pid": os.getpid(),
+                    "tid": e["tid"],
+                }
+                for e in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False, indent=1)
+
+        lines = [f"{'start(ms)':>10}  {'dur(ms)':>10}  phase", "-" * 60]
+        for e in events:
+            lines.append(f"{e['start'] / 1000:>10.1f}  {e['dur'] / 1000:>10.1f}  {'  ' * e['depth']}{e['name']}")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        return trace_path, summary_path
+
+
+startupProfiler = StartupProfiler()
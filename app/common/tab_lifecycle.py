@@ -0,0 +1,312 @@
+# coding: utf-8
+"""
+标签页生命周期
+插件标签页的页面控件可以实现以下可选方法，主窗口在对应的时机调用：
+    onTabOpened()          标签页打开
+    onTabHibernate()       标签页进入休眠，释放可以重新生成的数据
+    onTabClosed()          标签页关闭，停止后台任务、释放结果
+    memoryUsage() -> int   标签页占用的内存（字节），未实现时按 Python 对象和表格/文本内容估算
+    saveTabState() -> obj  休眠前返回可以 pickle 的视图状态和结果
+    restoreTabState(obj)   休眠的标签页重新显示时，在新建的页面上恢复状态
+
+实现了 saveTabState 并通过 MainWindow.registerTabRestorer 注册了页面工厂的标签页，
+空闲超时后状态写入磁盘缓存、页面控件被删除，切换回来时重新创建。
+
+关闭或删除页面时，页面及子控件属性中引用的任务引擎 Task 被取消（命令任务连同子进程一起结束），
+QThread 被请求退出，线程对象属性中保存的 Popen 子进程被结束。
+"""
+import hashlib
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import time
+
+from PyQt6.QtCore import QObject, QThread, QCoreApplication, QAbstractItemModel
+from PyQt6.QtGui import QTextDocument
+from loguru import logger
+
+from .config import ROOTPATH
+from .task_engine import Task, PENDING, RUNNING
+
+# 关闭标签页时在界面线程中等待后台线程退出的最长时间（毫秒），超时的线程转交给应用程序继续运行
+THREAD_STOP_TIMEOUT = 500
+# 休眠标签页的状态缓存目录，每个进程使用以 pid 命名的子目录，同时运行多个实例时互不影响
+TAB_CACHE_ROOT = os.path.join(ROOTPATH, "appData", "tab_cache")
+TAB_CACHE_DIR = os.path.join(TAB_CACHE_ROOT, str(os.getpid()))
+# 估算内存时，容器元素超过这个数量就抽样计算
+SAMPLE_SIZE = 200
+# 估算内存时最多遍历的对象数量，超过后不再深入
+MAX_VISITED = 20000
+# 表格模型每个单元格、文本文档每个段落的大致开销（字节）
+MODEL_CELL_BYTES = 128
+TEXT_BLOCK_BYTES = 100
+
+# 页面删除时仍在运行的线程，结束后再删除
+_detached_threads = set()
+
+
+def call_hook(widget, name: str, *args):
+    """调用页面控件上的生命周期方法，未实现时返回 None"""
+    hook = getattr(widget, name, None)
+    if not callable(hook):
+        return None
+    try:
+        return hook(*args)
+    except Exception as e:
+        logger.exception("[标签页] {}.{} 执行失败: {}", type(widget).__name__, name, e)
+        return None
+
+
+def _owned_objects(widget):
+    """页面控件及其所有子对象"""
+    return [widget] + list(widget.findChildren(QObject))
+
+
+def find_threads(widget):
+    """页面上的后台线程：子对象中的 QThread 以及各对象属性中引用的 QThread"""
+    threads = {}
+    for obj in _owned_objects(widget):
+        if isinstance(obj, QThread):
+            threads[id(obj)] = obj
+        for value in getattr(obj, "__dict__", {}).values():
+            if isinstance(value, QThread):
+                threads[id(value)] = value
+    return list(threads.values())
+
+
+def find_tasks(widget):
+    """页面上的任务：各对象属性中引用的任务引擎 Task"""
+    tasks = {}
+    for obj in _owned_objects(widget):
+        for value in getattr(obj, "__dict__", {}).values():
+            if isinstance(value, Task):
+                tasks[id(value)] = value
+    return list(tasks.values())
+
+
+def _task_active(task) -> bool:
+    return task.state in (PENDING, RUNNING)
+
+
+def has_running_threads(widget) -> bool:
+    """页面上是否有仍在运行的后台线程或未结束的任务"""
+    return (any(_is_running(thread) for thread in find_threads(widget))
+            or any(_task_active(task) for task in find_tasks(widget)))
+
+
+def _is_running(thread) -> bool:
+    try:
+        return thread.isRunning()
+    except RuntimeError:
+        # C++ 对象已被删除
+        return False
+
+
+def kill_process_tree(process):
+    """结束进程及其子进程（shell=True 时真正的工具是 cmd 的子进程）"""
+    if process.poll() is not None:
+        return
+    try:
+        if sys.platform == "win32":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           creationflags=subprocess.CREATE_NO_WINDOW)
+        else:
+            process.kill()
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning("[标签页] 结束进程 {} 失败: {}", process.pid, e)
+
+
+def _thread_processes(thread):
+    """线程对象属性中保存的子进程"""
+    return [v for v in getattr(thread, "__dict__", {}).values() if isinstance(v, subprocess.Popen)]
+
+
+def stop_threads(widget, timeout: int = THREAD_STOP_TIMEOUT):
+    """
+    取消页面上的任务，请求后台线程退出并结束它们启动的子进程，返回在 timeout 毫秒内没有退出的线程
+    所有线程共用一个等待时限，不会因为线程多而长时间卡住界面；任务在任务引擎的线程中结束，不需要等待
+    """
+    for task in find_tasks(widget):
+        if _task_active(task):
+            task.cancel()
+
+    running = [thread for thread in find_threads(widget) if _is_running(thread)]
+    for thread in running:
+        thread.requestInterruption()
+        thread.quit()
+        for process in _thread_processes(thread):
+            kill_process_tree(process)
+
+    deadline = time.monotonic() + timeout / 1000
+    remaining = []
+    for thread in running:
+        left = max(0, int((deadline - time.monotonic()) * 1000))
+        if not thread.wait(left):
+            remaining.append(thread)
+    return remaining
+
+
+def detach_thread(thread):
+    """线程仍在运行时不随页面一起删除：转交给应用程序，线程结束后再删除"""
+    _detached_threads.add(thread)
+    thread.setParent(QCoreApplication.instance())
+
+    def release():
+        if thread in _detached_threads:
+            _detached_threads.discard(thread)
+            thread.deleteLater()
+
+    thread.finished.connect(release)
+    if not _is_running(thread):
+        release()
+    else:
+        logger.warning("[标签页] 线程 {} 未能在 {} ms 内退出，将在结束后删除", type(thread).__name__, THREAD_STOP_TIMEOUT)
+
+
+def _sizeof(value, seen: set, depth: int = 0) -> int:
+    if id(value) in seen or depth > 6:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value, 0)
+    if len(seen) > MAX_VISITED:
+        return size
+
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, QObject):
+        # 子对象单独统计，避免沿着 parent/信号引用走到整个窗口
+        return 0
+    if isinstance(value, dict):
+        items = list(value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return size
+
+    if not items:
+        return size
+    sample = items[:SAMPLE_SIZE]
+    total = sum(_sizeof(item, seen, depth + 1) for item in sample)
+    # 元素很多时按抽样的平均大小估算
+    return size + total * len(items) // len(sample)
+
+
+def memory_report(widget) -> dict:
+    """
+    估算标签页持有的内存（字节）：
+    python 为页面及子控件属性引用的 Python 对象，models 为表格/列表模型（rows 为行数），text 为文本框内容
+    页面实现了 memoryUsage() 时只返回 {"total": 该值}
+    """
+    usage = call_hook(widget, "memoryUsage")
+    if usage is not None:
+        return {"total": int(usage)}
+
+    seen = set()
+    report = {"python": sum(_sizeof(getattr(obj, "__dict__", {}), seen) for obj in _owned_objects(widget)),
+              "models": 0, "rows": 0, "text": 0}
+    for model in widget.findChildren(QAbstractItemModel):
+        rows = model.rowCount()
+        report["rows"] += rows
+        report["models"] += rows * max(1, model.columnCount()) * MODEL_CELL_BYTES
+    for document in widget.findChildren(QTextDocument):
+        # QString 为 UTF-16，每个字符 2 字节
+        report["text"] += document.characterCount() * 2 + document.blockCount() * TEXT_BLOCK_BYTES
+    report["total"] = report["python"] + report["models"] + report["text"]
+    return report
+
+
+def estimate_memory(widget) -> int:
+    """估算标签页持有的内存（字节）"""
+    return memory_report(widget)["total"]
+
+
+def discard_page(widget):
+    """
+    停止后台线程并删除页面控件
+    没能及时退出的线程转交给应用程序，不随页面删除；页面删除后清空页面自身的属性，
+    其他对象仍被引用时（例如仍在运行的线程）由引用计数决定何时释放
+    """
+    for thread in stop_threads(widget):
+        detach_thread(thread)
+    widget.destroyed.connect(lambda _=None, attrs=vars(widget): attrs.clear())
+    widget.deleteLater()
+
+
+def close_tab(widget):
+    """关闭标签页：调用 onTabClosed、停止后台线程并删除页面控件"""
+    call_hook(widget, "onTabClosed")
+    discard_page(widget)
+
+
+def _cache_path(routeKey: str) -> str:
+    name = hashlib.sha1(routeKey.encode("utf-8")).hexdigest()
+    return os.path.join(TAB_CACHE_DIR, name + ".pkl")
+
+
+def save_tab_state(routeKey: str, state) -> str:
+    """把标签页状态写入磁盘缓存，返回缓存文件路径"""
+    os.makedirs(TAB_CACHE_DIR, exist_ok=True)
+    path = _cache_path(routeKey)
+    with open(path + ".tmp", "wb") as f:
+        pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def load_tab_state(path: str):
+    """读取并删除缓存文件"""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    finally:
+        remove_tab_state(path)
+
+
+def remove_tab_state(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _process_alive(pid: int) -> bool:
+    if sys.platform == "win32":
+        import ctypes
+        SYNCHRONIZE = 0x00100000
+        WAIT_TIMEOUT = 0x00000102
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(SYNCHRONIZE, False, pid)
+        if not handle:
+            return False
+        try:
+            return kernel32.WaitForSingleObject(handle, 0) == WAIT_TIMEOUT
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def prune_tab_cache():
+    """删除已经退出的进程遗留的标签页缓存，其他仍在运行的实例的缓存保留"""
+    try:
+        names = os.listdir(TAB_CACHE_ROOT)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(TAB_CACHE_ROOT, name)
+        if name.isdigit() and (int(name) == os.getpid() or _process_alive(int(name))):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            remove_tab_state(path)
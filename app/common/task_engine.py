@@ -0,0 +1,411 @@
+# coding: utf-8
+"""
+任务引擎
+插件把外部工具命令或耗时函数提交给 taskEngine，由固定大小的线程池按优先级执行，
+不再各自创建 Worker(QThread)。同时运行的任务数受配置限制，任务可以取消、可以设置超时，
+输出不逐行写日志：完整输出写入 appData/log/tasks 下每个任务单独的文件，
+界面只从固定大小的环形缓冲区中按帧读取（见 app.view.task_console.TaskConsole）。
+
+    task = taskEngine.submit("python ramparse.py ...", name="Linux Ramdump", cwd=tool_dir,
+                             progress=r"(\d+)%")
+    self.console.attach(task)
+    task.progressChanged.connect(self.progressBar.setValue)
+    task.finished.connect(self.onFinished)
+    ...
+    task.cancel()
+"""
+import codecs
+import collections
+import heapq
+import itertools
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from loguru import logger
+
+from .config import cfg, ROOTPATH
+
+# 优先级，数值越小越先执行
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+# 任务状态
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMEOUT = "timeout"
+
+READ_SIZE = 64 * 1024
+# 环形缓冲区保留的输出行数；界面来不及读取时丢弃最早的行，完整输出仍在任务输出文件中
+OUTPUT_BUFFER_LINES = 20000
+# 任务输出文件
+TASK_LOG_DIR = os.path.join(ROOTPATH, "appData", "log", "tasks")
+TASK_LOG_RETENTION = 7 * 24 * 3600
+FILE_BUFFER_SIZE = 1024 * 1024
+
+
+class Task(QObject):
+    """ A command or callable submitted to the task engine """
+
+    # 信号：任务开始执行
+    started = pyqtSignal()
+    # 信号：有新的输出可以用 takeOutput() 读取；读取之前不会再次发出，界面线程的事件队列不会被输出挤满
+    outputReady = pyqtSignal()
+    # 信号：进度 0-100
+    progressChanged = pyqtSignal(int)
+    # 信号：任务结束，参数为结束状态（SUCCEEDED / FAILED / CANCELLED / TIMEOUT）
+    finished = pyqtSignal(str)
+
+    _ids = itertools.count(1)
+
+    def __init__(self, target, name="", cwd=None, env=None, priority=PRIORITY_NORMAL,
+                 timeout=None, encoding="gbk", progress=None, args=(), kwargs=None):
+        super().__init__()
+        self.id = next(self._ids)
+        self.target = target
+        self.name = name or (target if isinstance(target, str) else getattr(target, "__name__", "task"))
+        self.cwd = cwd
+        self.env = env
+        self.priority = priority
+        self.timeout = timeout
+        self.encoding = encoding
+        self.progressPattern = re.compile(progress) if isinstance(progress, str) else progress
+        self.args = args
+        self.kwargs = kwargs or {}
+
+        self.state = PENDING
+        self.returncode = None
+        self.result = None
+        self.error = None
+        self.progress = -1
+        self.startTime = None
+        self.endTime = None
+
+        self._engine = None
+        self._cancelEvent = threading.Event()
+        self._timedOut = False
+        self._process = None
+        self._lock = threading.Lock()
+        self._buffer = collections.deque(maxlen=OUTPUT_BUFFER_LINES)
+        self._dropped = 0
+        self._notified = False
+        self.outputPath = None
+        self._outputFile = None
+        # 输出文件可能在工作线程中写入的同时被界面线程关闭（取消排队中的任务时）
+        self._fileLock = threading.Lock()
+
+    @property
+    def isCommand(self):
+        return isinstance(self.target, (str, list, tuple))
+
+    def isCancelled(self) -> bool:
+        """ 函数任务应定期检查，返回 True 时尽快退出 """
+        return self._cancelEvent.is_set()
+
+    def cancel(self):
+        """ 取消任务：排队中的任务不再执行，运行中的命令连同子进程一起结束 """
+        self._cancelEvent.set()
+        if self._engine is not None:
+            self._engine._dequeue(self)
+        self._kill()
+
+    def reportProgress(self, percent: int):
+        percent = max(0, min(100, int(percent)))
+        if percent != self.progress:
+            self.progress = percent
+            self.progressChanged.emit(percent)
+
+    def write(self, line: str):
+        """ 函数任务输出一行 """
+        self._append([line])
+
+    def takeOutput(self):
+        """ 取出缓冲区中的输出，返回 (行列表, 自上次读取以来因缓冲区满而丢弃的行数) """
+        with self._lock:
+            lines = list(self._buffer)
+            self._buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+            self._notified = False
+        return lines, dropped
+
+    def elapsed(self) -> float:
+        if self.startTime is None:
+            return 0.0
+        return (self.endTime or time.monotonic()) - self.startTime
+
+    def _append(self, lines):
+        with self._fileLock:
+            # 任务结束、文件关闭后的输出不再写入文件
+            if self._outputFile is not None:
+                self._outputFile.write("\n".join(lines) + "\n")
+        with self._lock:
+            overflow = len(self._buffer) + len(lines) - OUTPUT_BUFFER_LINES
+            if overflow > 0:
+                self._dropped += overflow
+            self._buffer.extend(lines)
+            notify, self._notified = not self._notified, True
+        if notify:
+            self.outputReady.emit()
+
+    def _openOutput(self):
+        os.makedirs(TASK_LOG_DIR, exist_ok=True)
+        name = re.sub(r"[^\w.-]+", "_", self.name)[:40]
+        self.outputPath = os.path.join(TASK_LOG_DIR, "{}-{}-{}.log".format(time.strftime("%Y%m%d-%H%M%S"), self.id, name))
+        outputFile = open(self.outputPath, "w", encoding="utf-8", errors="replace", buffering=FILE_BUFFER_SIZE)
+        if self.isCommand:
+            target = self.target if isinstance(self.target, str) else subprocess.list2cmdline(self.target)
+            outputFile.write("# {}\n".format(target))
+        with self._fileLock:
+            self._outputFile = outputFile
+
+    def _closeOutput(self):
+        with self._fileLock:
+            outputFile, self._outputFile = self._outputFile, None
+        if outputFile is not None:
+            outputFile.close()
+
+    def _onTimeout(self):
+        self._timedOut = True
+        self.cancel()
+
+    def _kill(self):
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                # shell=True 时真正的工具是 cmd 的子进程，需要结束整个进程树
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               creationflags=subprocess.CREATE_NO_WINDOW)
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("[任务引擎] 结束任务 {} 的进程失败: {}", self.name, e)
+
+    def _run(self):
+        if self.isCommand:
+            self.returncode = self._runCommand()
+            return self.returncode == 0
+        self.result = self.target(self, *self.args, **self.kwargs)
+        return True
+
+    def _runCommand(self):
+        kwargs = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        else:
+            kwargs["start_new_session"] = True
+        self._process = subprocess.Popen(
+            self.target, shell=isinstance(self.target, str), cwd=self.cwd, env=self.env,
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, **kwargs)
+        if self.isCancelled():
+            self._kill()
+
+        # 按块读取并增量解码，多字节字符被切开时留到下一块
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        partial = ""
+        stream = self._process.stdout
+        while True:
+            chunk = stream.read1(READ_SIZE) if hasattr(stream, "read1") else stream.read(READ_SIZE)
+            lines = (partial + decoder.decode(chunk, final=not chunk)).splitlines(True)
+            partial = ""
+            # 最后一行还没有结束（或只读到了 \r\n 中的 \r），与下一块拼接
+            if chunk and lines and (lines[-1].endswith("\r") or not lines[-1].endswith(("\n", "\r"))):
+                partial = lines.pop()
+            if lines:
+                self._handleLines([line.rstrip("\r\n") for line in lines])
+            if not chunk:
+                break
+        stream.close()
+        return self._process.wait()
+
+    def _handleLines(self, lines):
+        if self.progressPattern is not None:
+            for line in reversed(lines):
+                match = self.progressPattern.search(line)
+                if match:
+                    try:
+                        self.reportProgress(float(match.group(1)))
+                    except (IndexError, ValueError):
+                        pass
+                    break
+        self._append(lines)
+
+
+class TaskEngine(QObject):
+    """ Bounded, prioritized pool that runs plugin tasks """
+
+    # 信号：任务状态变化（任务开始或结束）
+    taskStateChanged = pyqtSignal(object)
+
+    def __init__(self):
+        super().__init__()
+        self._queue = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._workers = []
+        self._idle = 0
+        self._running = set()
+        self._shutdown = False
+        self._logsPruned = False
+
+    def maxWorkers(self) -> int:
+        return cfg.get(cfg.maxParallelTasks)
+
+    def submit(self, target, name="", cwd=None, env=None, priority=PRIORITY_NORMAL,
+               timeout=None, encoding="gbk", progress=None, args=(), kwargs=None) -> Task:
+        """
+        提交任务并返回 Task
+        target: 命令字符串（通过 shell 执行）、参数列表，或函数 func(task, *args, **kwargs)
+        timeout: 超时秒数，超时后任务被取消，状态为 TIMEOUT
+        encoding: 命令输出的编码
+        progress: 正则表达式，第一个分组为输出中的进度百分比
+        """
+        task = Task(target, name, cwd, env, priority, timeout, encoding, progress, args, kwargs)
+        task._engine = self
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("任务引擎已关闭")
+            heapq.heappush(self._queue, (priority, next(self._seq), task))
+            if self._idle == 0 and len(self._workers) < self.maxWorkers():
+                worker = threading.Thread(target=self._workerLoop, name="TaskWorker", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        logger.info("[任务引擎] 提交任务 #{} {}（优先级 {}，排队 {} 个）", task.id, task.name, priority, len(self._queue))
+        return task
+
+    def tasks(self):
+        """ 排队中和运行中的任务 """
+        with self._cond:
+            return [t for _, _, t in sorted(self._queue)] + list(self._running)
+
+    def _pruneTaskLogs(self):
+        """ 删除过期的任务输出文件 """
+        cutoff = time.time() - TASK_LOG_RETENTION
+        try:
+            with os.scandir(TASK_LOG_DIR) as it:
+                for entry in it:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.remove(entry.path)
+        except OSError:
+            pass
+
+    def _dequeue(self, task: Task):
+        """ 排队中的任务被取消时直接移出队列并结束 """
+        with self._cond:
+            entries = [e for e in self._queue if e[2] is task]
+            if not entries:
+                return
+            self._queue.remove(entries[0])
+            heapq.heapify(self._queue)
+        self._finish(task, CANCELLED)
+
+    def cancelAll(self):
+        for task in self.tasks():
+            task.cancel()
+
+    def shutdown(self, wait: float = 5.0):
+        """ 程序退出时取消全部任务 """
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        self.cancelAll()
+        deadline = time.monotonic() + wait
+        for worker in list(self._workers):
+            worker.join(max(0.0, deadline - time.monotonic()))
+
+    def _next(self):
+        with self._cond:
+            while True:
+                # 关闭时，或并发数设置调小后多出来的线程，在空闲时退出
+                if self._shutdown or len(self._workers) > self.maxWorkers():
+                    self._workers.remove(threading.current_thread())
+                    return None
+                if self._queue and len(self._running) < self.maxWorkers():
+                    task = heapq.heappop(self._queue)[2]
+                    self._running.add(task)
+                    return task
+                self._idle += 1
+                self._cond.wait()
+                self._idle -= 1
+
+    def _workerLoop(self):
+        while True:
+            task = self._next()
+            if task is None:
+                return
+            try:
+                self._execute(task)
+            finally:
+                with self._cond:
+                    self._running.discard(task)
+                    self._cond.notify()
+
+    def _execute(self, task: Task):
+        if task.isCancelled():
+            self._finish(task, CANCELLED)
+            return
+
+        if not self._logsPruned:
+            self._logsPruned = True
+            self._pruneTaskLogs()
+        try:
+            task._openOutput()
+        except OSError as e:
+            logger.warning("[任务引擎] 无法创建任务 {} 的输出文件: {}", task.name, e)
+
+        task.state = RUNNING
+        task.startTime = time.monotonic()
+        self.taskStateChanged.emit(task)
+        task.started.emit()
+        logger.info("[任务引擎] 开始任务 #{} {}", task.id, task.name)
+
+        timer = None
+        if task.timeout:
+            timer = threading.Timer(task.timeout, task._onTimeout)
+            timer.daemon = True
+            timer.start()
+        try:
+            ok = task._run()
+            state = SUCCEEDED if ok else FAILED
+        except Exception as e:
+            task.error = e
+            state = FAILED
+            logger.exception("[任务引擎] 任务 #{} {} 出错: {}", task.id, task.name, e)
+        finally:
+            if timer is not None:
+                timer.cancel()
+            task._process = None
+
+        if task._timedOut:
+            state = TIMEOUT
+        elif task.isCancelled():
+            state = CANCELLED
+        self._finish(task, state)
+
+    def _finish(self, task: Task, state: str):
+        task._closeOutput()
+        task.state = state
+        task.endTime = time.monotonic()
+        if task.startTime is None:
+            task.startTime = task.endTime
+        if state == SUCCEEDED:
+            task.reportProgress(100)
+        logger.info("[任务引擎] 任务 #{} {} 结束: {}，返回码 {}，耗时 {:.1f}s，输出: {}",
+                    task.id, task.name, state, task.returncode, task.elapsed(), task.outputPath)
+        self.taskStateChanged.emit(task)
+        task.finished.emit(state)
+
+
+taskEngine = TaskEngine()
@@ -0,0 +1,111 @@
+# coding: utf-8
+"""
+多线程解压
+插件包和应用更新包按成员并行解压：每个线程使用独立的 ZipFile 句柄，大文件优先，
+写入前检查剩余空间并预先分配文件大小，每解压完一个成员回调一次进度。
+"""
+import os
+import shutil
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from loguru import logger
+
+# 剩余空间至少要比解压后的总大小多出的余量
+FREE_SPACE_MARGIN = 64 * 1024 * 1024
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def _safe_path(dest: str, name: str) -> str:
+    """成员在 dest 中的路径，拒绝绝对路径和 .. 跳出目标目录"""
+    parts = name.replace("\\", "/").split("/")
+    if name.startswith(("/", "\\")) or ".." in parts or ":" in parts[0]:
+        raise ValueError("压缩包中存在非法路径: {}".format(name))
+    return os.path.join(dest, *[p for p in parts if p])
+
+
+def check_free_space(dest: str, required: int):
+    """dest 所在磁盘的剩余空间不足时抛出 OSError"""
+    # 相对路径逐级取上级目录会得到 ''，先转换为绝对路径
+    probe = os.path.abspath(dest)
+    while not os.path.exists(probe):
+        parent = os.path.dirname(probe)
+        if parent == probe:
+            break
+        probe = parent
+    free = shutil.disk_usage(probe).free
+    if free < required + FREE_SPACE_MARGIN:
+        raise OSError("磁盘空间不足: 需要 {:.1f} MB，剩余 {:.1f} MB".format(
+            (required + FREE_SPACE_MARGIN) / 1024 / 1024, free / 1024 / 1024))
+
+
+def extract_zip(zip_path: str, dest: str, members: dict = None, workers: int = None, progress=None):
+    """
+    并行解压 zip_path 到 dest，返回压缩包中的成员名列表
+    members: {成员名: 相对 dest 的输出路径}，只解压其中的成员；None 表示全部按原路径解压
+    progress: progress(已完成字节数, 总字节数)，每解压完一个成员在调用线程中调用一次
+    成员 CRC 校验失败时抛出 zipfile.BadZipFile
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        names = zf.namelist()
+        infos = zf.infolist()
+
+    if members is not None:
+        infos = [i for i in infos if i.filename in members]
+    targets = {}
+    for info in infos:
+        targets[info.filename] = _safe_path(dest, members[info.filename] if members is not None else info.filename)
+
+    files = [i for i in infos if not i.is_dir()]
+    total = sum(i.file_size for i in files)
+    check_free_space(dest, total)
+
+    # 先创建目录，工作线程只负责写文件
+    for info in infos:
+        path = targets[info.filename]
+        os.makedirs(path if info.is_dir() else os.path.dirname(path), exist_ok=True)
+
+    # 大文件先开始，避免最后只剩一个线程在解压大文件
+    files.sort(key=lambda i: i.file_size, reverse=True)
+    workers = max(1, min(workers or os.cpu_count() or 4, len(files)))
+    local = threading.local()
+    handles = []
+    lock = threading.Lock()
+
+    def extract_one(info):
+        zf = getattr(local, "zf", None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path)
+            with lock:
+                handles.append(zf)
+
+        path = targets[info.filename]
+        with zf.open(info) as src, open(path, "wb") as dst:
+            if info.file_size:
+                # 预先分配文件大小，减少磁盘碎片
+                dst.truncate(info.file_size)
+            shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+        return info.file_size
+
+    done = 0
+    futures = []
+    pool = ThreadPoolExecutor(workers)
+    try:
+        futures = [pool.submit(extract_one, info) for info in files]
+        for future in as_completed(futures):
+            done += future.result()
+            if progress:
+                progress(done, total)
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        pool.shutdown(wait=True)
+        for zf in handles:
+            zf.close()
+
+    logger.info("[解压] {} -> {}: {} 个文件, {:.1f} MB, {} 个线程",
+                os.path.basename(str(zip_path)), dest, len(files), total / 1024 / 1024, workers)
+    return names
@@ -205,6 +205,7 @@ class GeneralInterface(ScrollArea):
         #self.parent.tabBar.currentChanged.connect(self.parent.onTabChanged)
         #self.parent.tabBar.tabAddRequested.connect(self.parent.onTabAddRequested)
 
+        self.cards = {}
         self.__initWidget()
 
         #suffix = ":/qfluentwidgets/images/controls"
@@ -220,6 +221,9 @@ class GeneralInterface(ScrollArea):
 
 
     def addCard(self, icon, title, content, UniqueName):
+        # 同一个UniqueName只创建一张卡片（按需加载的插件在导入后会再次调用addCard）
+        if UniqueName in self.cards:
+            return self.cards[UniqueName]
         #logger.info("[LIUQI] Adding card: {}, {}, {}".format(icon, title, content))
         self.card = AppCard(icon=icon, title=title, content=content, parent=self.scrollAreaWidgetContents, UniqueName=UniqueName, mainWindow=self.parent)
 
@@ -227,6 +231,8 @@ class GeneralInterface(ScrollArea):
 
         # 将card组件加入到设置好的滚动布局中
         self.expandLayout.addWidget(self.card)
+        self.cards[UniqueName] = self.card
+        return self.card
 
         #self.flowlayout.addWidget(card)
 
@@ -1,9 +1,9 @@
 # coding: utf-8
 from pathlib import Path
 import time
-from PyQt6.QtCore import Qt, QSize, QUrl, QPoint
+from PyQt6.QtCore import Qt, QSize, QUrl, QPoint, QTimer, QEvent, pyqtSignal
 from PyQt6.QtGui import QIcon, QColor
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QToolTip
 
 from qfluentwidgets import NavigationItemPosition, MSFluentWindow, SplashScreen
 from qfluentwidgets import FluentIcon as FIF
@@ -13,7 +13,7 @@ from qfluentwidgets import (NavigationItemPosition, MessageBox, MSFluentTitleBar
                             TransparentDropDownToolButton, TransparentToolButton, setTheme, Theme,
                             isDarkTheme)
 
-from plugins.plugin_loader import load_plugins
+from ..common.plugin_loader import iter_load_plugins
 
 from .setting_interface import SettingInterface
 from .mtk_interface import MtkInterface
@@ -26,8 +26,10 @@ from ..common.signal_bus import signalBus
 from ..common import resource
 from ..common.logging import logger
 from ..common.app_updater import AppUpdater
+from ..common.startup_profiler import startupProfiler
+from ..common import tab_lifecycle
 
-from plugins.plugin_market import PluginMarket
+from .plugin_market import PluginMarket
 
 class Widget(QFrame):
 
@@ -63,6 +65,45 @@ class TabInterface(QFrame):
 
         self.setObjectName(objectName)
 
+# 检查空闲标签页是否需要休眠的间隔（毫秒）
+TAB_HIBERNATE_INTERVAL = 60000
+
+class RouteStackedWidget(QStackedWidget):
+    """ Stacked widget that indexes its pages by routeKey (objectName) """
+
+    # 信号：添加了一个带 routeKey 的页面 (routeKey, widget)
+    routeAdded = pyqtSignal(str, object)
+
+    def __init__(self, parent=None, objectName=''):
+        super().__init__(parent, objectName=objectName)
+        # routeKey -> widget，由 addWidget / removeWidget 维护
+        self.routes = {}
+
+    def addWidget(self, widget):
+        index = super().addWidget(widget)
+        routeKey = widget.objectName()
+        if routeKey:
+            self.routes[routeKey] = widget
+            widget.destroyed.connect(lambda _=None, k=routeKey: self.routes.pop(k, None))
+            self.routeAdded.emit(routeKey, widget)
+        return index
+
+    def removeWidget(self, widget):
+        routeKey = widget.objectName()
+        if self.routes.get(routeKey) is widget:
+            del self.routes[routeKey]
+        super().removeWidget(widget)
+
+    def widgetForRoute(self, routeKey: str):
+        return self.routes.get(routeKey)
+
+    def findChild(self, type, name='', options=Qt.FindChildOption.FindChildrenRecursively):
+        # 插件按 routeKey 查找标签页时直接查表，不再遍历整个控件树
+        widget = self.routes.get(name)
+        if widget is not None and isinstance(widget, type):
+            return widget
+        return super().findChild(type, name, options)
+
 class CustomTitleBar(MSFluentTitleBar):
     """ Title bar with icon and title """
 
@@ -124,7 +165,11 @@ class CustomTitleBar(MSFluentTitleBar):
 
 class MainWindow(MSFluentWindow):
 
-    def __init__(self):
+    def __init__(self, prebuild: bool = False):
+        """
+        prebuild: 为 True 时只创建窗口本身，界面由调用方按 buildSteps() 分步构建（例如在登录界面显示期间），
+                  全部完成后调用 reveal() 显示窗口
+        """
         super().__init__()
 
         self.setTitleBar(CustomTitleBar(self))
@@ -132,26 +177,85 @@ class MainWindow(MSFluentWindow):
         self.tabBar.tabCloseRequested.connect(self.removetab)
         self.pluginOpenerMap = {}
         self.tabChangedHandlers = {}
+        # routeKey -> 处理该标签页切换的插件回调列表，首次切换到该标签页时解析
+        self.routeHandlers = {}
         self.TabRouteKeys = []
+        # 空闲标签页休眠：routeKey -> 页面工厂、routeKey -> 状态缓存文件
+        self.tabRestorers = {}
+        self.hibernatedTabs = {}
+        # 已空闲但不支持休眠（或保存失败）的标签页，再次切换到之前不重复处理
+        self.idleTabs = set()
+        # routeKey -> 最后一次离开该标签页的时间
+        self.tabLastActive = {}
+        self.currentRoute = None
+        tab_lifecycle.prune_tab_cache()
+        self.tabHibernateTimer = QTimer(self)
+        self.tabHibernateTimer.setInterval(TAB_HIBERNATE_INTERVAL)
+        self.tabHibernateTimer.timeout.connect(self.hibernateIdleTabs)
         self.appUpdater = AppUpdater()
+        self.prebuild = prebuild
+        self.pluginLoader = None
 
         # 检查自动更新按钮是否被启用
         if cfg.get(cfg.checkUpdateAtStartUp):
-            # 如果启用，则连接到自动更新信号
-            signalBus.Update(auto=True)
-            # 启动时自动检查应用更新（静默）
-            self._check_app_update_on_startup()
-                
+            # 如果启用，则连接到自动更新信号（后台线程，可以与界面构建同时进行）
+            with startupProfiler.span("signalBus.Update(auto=True)"):
+                signalBus.Update(auto=True)
+
         #self.tabBar.currentChanged.connect(self.onTabChanged)
 
+        if not prebuild:
+            for step in self.buildSteps():
+                while step():
+                    pass
+            self.reveal()
+
+    def buildSteps(self):
+        """
+        按顺序返回构建界面的各个步骤，每一步都较短，可以分散到事件循环的空闲时间中执行
+        步骤返回 True 表示还没有完成，需要再次调用（例如每次只加载一个插件）
+        """
+        return [
+            self._createSettingInterface,
+            self._createGeneralInterface,
+            self._createQcomInterface,
+            self._createMtkInterface,
+            self._createHomeInterface,
+            self._initNavigationStep,
+            self._initWindowStep,
+            self._loadPluginsStep,
+        ]
+
+    def reveal(self):
+        """ 界面构建完成后显示窗口，并开始启动时的更新检查 """
+        if self.prebuild:
+            self.show()
+
+        # 启动时自动检查应用更新（静默）
+        if cfg.get(cfg.checkUpdateAtStartUp):
+            self._check_app_update_on_startup()
+
+    def _createSettingInterface(self):
         # TODO: create sub interface
-        self.settingInterface = SettingInterface(self)
-        self.generalInterface = GeneralInterface(self)
-        self.showInterface = QStackedWidget(self, objectName='showInterface')
+        with startupProfiler.span("SettingInterface.__init__"):
+            self.settingInterface = SettingInterface(self)
+
+    def _createGeneralInterface(self):
+        with startupProfiler.span("GeneralInterface.__init__"):
+            self.generalInterface = GeneralInterface(self)
+        self.showInterface = RouteStackedWidget(self, objectName='showInterface')
+        self.showInterface.routeAdded.connect(self._onTabOpened)
         self.homeInterface = QStackedWidget(self, objectName='homeInterface')
-        self.qcomInterface = QcomInterface(self)
-        self.mtkInterface = MtkInterface(self)
 
+    def _createQcomInterface(self):
+        with startupProfiler.span("QcomInterface.__init__"):
+            self.qcomInterface = QcomInterface(self)
+
+    def _createMtkInterface(self):
+        with startupProfiler.span("MtkInterface.__init__"):
+            self.mtkInterface = MtkInterface(self)
+
+    def _createHomeInterface(self):
         # 在homeinterface的正中央添加一个widget，显示ONEMORE字符串
         homewidget = Widget('ONEMORE', self.homeInterface)
         self.homeInterface.addWidget(homewidget)
@@ -164,13 +268,26 @@ class MainWindow(MSFluentWindow):
 
         self.connectSignalToSlot()
 
+    def _initNavigationStep(self):
         # add items to navigation interface
-        self.initNavigation()
-        self.initWindow()
-
-        self.splashScreen.finish()
-
-        load_plugins(self)# add interfaces to showInterface
+        with startupProfiler.span("MainWindow.initNavigation"):
+            self.initNavigation()
+
+    def _initWindowStep(self):
+        with startupProfiler.span("MainWindow.initWindow"):
+            self.initWindow()
+
+    def _loadPluginsStep(self):
+        if self.pluginLoader is None:
+            if not self.prebuild:
+                self.splashScreen.finish()
+            self.pluginLoader = iter_load_plugins(self)
+
+        # 每次只加载一个插件，还有插件未加载时返回 True
+        with startupProfiler.span("load_plugins"):
+            if next(self.pluginLoader, None) is not None:
+                return True
+        return False
     
     def _check_app_update_on_startup(self):
         """启动时静默检查更新"""
@@ -213,7 +330,8 @@ class MainWindow(MSFluentWindow):
         self.addSubInterface(self.mtkInterface, FIF.APPLICATION, 'MTK')
         self.addSubInterface(self.qcomInterface, FIF.APPLICATION, '高通')
 
-        self.pluginMarketInterface = PluginMarket("plugins", self)
+        with startupProfiler.span("PluginMarket.__init__"):
+            self.pluginMarketInterface = PluginMarket("plugins", self)
         self.pluginMarketInterface.setObjectName("plugin-market")
 
         self.addSubInterface(
@@ -232,6 +350,7 @@ class MainWindow(MSFluentWindow):
         #self.addTab('Heart', 'As long as you love me', icon='resource/Heart.png')
 
         self.tabBar.currentChanged.connect(self.onTabChanged)
+        self.tabHibernateTimer.start()
 
         # 遍歷pluginOpenerMap, 將這個UNIQUE_NAME添加到tabBar中的currentChanged.connect，也就是self.onTabChanged
         # for uniqueName, openFunc in self.pluginOpenerMap.items():
@@ -258,14 +377,19 @@ class MainWindow(MSFluentWindow):
         self.setCustomBackgroundColor(QColor(240, 244, 249), QColor(32, 32, 32))
         self.setMicaEffectEnabled(cfg.get(cfg.micaEnabled))
 
+        desktop = QApplication.primaryScreen().availableGeometry()
+        w, h = desktop.width(), desktop.height()
+        self.move(w//2 - self.width()//2, h//2 - self.height()//2)
+
+        # 预先构建时窗口在 reveal() 中才显示，不需要启动画面
+        if self.prebuild:
+            return
+
         # create splash screen
         self.splashScreen = SplashScreen(self.windowIcon(), self)
         self.splashScreen.setIconSize(QSize(106, 106))
         self.splashScreen.raise_()
 
-        desktop = QApplication.primaryScreen().availableGeometry()
-        w, h = desktop.width(), desktop.height()
-        self.move(w//2 - self.width()//2, h//2 - self.height()//2)
         self.show()
         QApplication.processEvents()
 
@@ -276,11 +400,20 @@ class MainWindow(MSFluentWindow):
     
     def onTabChanged(self, index: int):
         objectName = self.tabBar.currentTab().routeKey()
+        if self.currentRoute is not None and self.currentRoute != objectName:
+            self.tabLastActive[self.currentRoute] = time.monotonic()
+        self.currentRoute = objectName
+        self.idleTabs.discard(objectName)
+        self._restoreTab(objectName)
+        self._watchTabItems()
+
+        widget = self.showInterface.widgetForRoute(objectName)
+        if widget is not None:
+            self.showInterface.setCurrentWidget(widget)
+
         # 插件注册的处理逻辑
-        for keyword, handler in self.tabChangedHandlers.items():
-            if keyword in objectName:
-                handler(objectName)
-                #return
+        for handler in self._handlersForRoute(objectName):
+            handler(objectName)
 
         # if "Linux Ramdump" in objectName:
         #     logger.info('[TAB CHANGED] Tab change to {}'.format(objectName))
@@ -328,19 +461,147 @@ class MainWindow(MSFluentWindow):
 
     def removetab(self, index: int):
         # 獲取指定index的tab的routeKey
-        routekey = self.tabBar.items[index]._routeKey
-
-        logger.info('[TAB REMOVE] {}'.format(routekey))
-        self.tabBar.removeTab(index)
-        self.showInterface.removeWidget(self.showInterface.widget(index))
+        self.closeTab(self.tabBar.items[index].routeKey())
+
+    def closeTab(self, routeKey: str):
+        """ 关闭标签页：停止页面上的后台线程并删除页面，释放其持有的数据 """
+        index = next((i for i, item in enumerate(self.tabBar.items) if item.routeKey() == routeKey), -1)
+        if index >= 0:
+            self.tabBar.removeTab(index)
+
+        # 标签页序号与 showInterface 中的页面序号不一定对应，按 routeKey 查找
+        widget = self.showInterface.widgetForRoute(routeKey)
+        if widget is not None:
+            usage = tab_lifecycle.estimate_memory(widget)
+            self.showInterface.removeWidget(widget)
+            tab_lifecycle.close_tab(widget)
+            logger.info('[TAB REMOVE] {}，释放约 {:.1f} MB'.format(routeKey, usage / 1024 / 1024))
+        else:
+            logger.info('[TAB REMOVE] {}'.format(routeKey))
+        path = self.hibernatedTabs.pop(routeKey, None)
+        if path:
+            tab_lifecycle.remove_tab_state(path)
+        self.tabLastActive.pop(routeKey, None)
+        self.idleTabs.discard(routeKey)
+        if self.currentRoute == routeKey:
+            self.currentRoute = None
+        self.routeHandlers.pop(routeKey, None)
         self.showInterface.setCurrentIndex(0)
 
         # 在移除tab時，刪除self.TabRouteKeys中的對應routeKey
-        if routekey in self.TabRouteKeys:
-            self.TabRouteKeys.remove(routekey)
+        if routeKey in self.TabRouteKeys:
+            self.TabRouteKeys.remove(routeKey)
+
+    def hibernateTab(self, routeKey: str) -> bool:
+        """
+        休眠后台标签页：状态写入磁盘缓存并删除页面控件，切换回该标签页时自动恢复，返回是否已休眠
+        页面需要实现 saveTabState / restoreTabState 且插件注册了页面工厂；不支持的页面只调用一次
+        onTabHibernate 释放可以重新生成的数据。后台线程或任务仍在运行的标签页不休眠
+        """
+        widget = self.showInterface.widgetForRoute(routeKey)
+        if widget is None or routeKey in self.hibernatedTabs or routeKey in self.idleTabs:
+            return False
+        if tab_lifecycle.has_running_threads(widget):
+            return False
+
+        self.idleTabs.add(routeKey)
+        tab_lifecycle.call_hook(widget, "onTabHibernate")
+        if self._restorerForRoute(routeKey) is None or not callable(getattr(widget, "saveTabState", None)):
+            return False
+
+        try:
+            path = tab_lifecycle.save_tab_state(routeKey, widget.saveTabState())
+        except Exception as e:
+            logger.warning('[TAB HIBERNATE] {} 保存状态失败: {}'.format(routeKey, e))
+            return False
+
+        usage = tab_lifecycle.estimate_memory(widget)
+        self.showInterface.removeWidget(widget)
+        tab_lifecycle.discard_page(widget)
+        self.idleTabs.discard(routeKey)
+        self.hibernatedTabs[routeKey] = path
+        logger.info('[TAB HIBERNATE] {}，释放约 {:.1f} MB'.format(routeKey, usage / 1024 / 1024))
+        return True
+
+    def hibernateIdleTabs(self):
+        """ 休眠空闲时间超过设置值的后台标签页 """
+        minutes = cfg.get(cfg.tabHibernateMinutes)
+        if not minutes:
+            return
+        now = time.monotonic()
+        for item in list(self.tabBar.items):
+            routeKey = item.routeKey()
+            if routeKey == self.currentRoute or routeKey in self.hibernatedTabs or routeKey in self.idleTabs:
+                continue
+            if now - self.tabLastActive.setdefault(routeKey, now) >= minutes * 60:
+                self.hibernateTab(routeKey)
+
+    def _restoreTab(self, routeKey: str):
+        """ 标签页重新显示时退出休眠：按缓存的状态重新创建页面 """
+        path = self.hibernatedTabs.pop(routeKey, None)
+        if path is None:
+            return
+
+        try:
+            state = tab_lifecycle.load_tab_state(path)
+            widget = self._restorerForRoute(routeKey)(routeKey)
+            widget.setObjectName(routeKey)
+            if self.showInterface.widgetForRoute(routeKey) is not widget:
+                self.showInterface.addWidget(widget)
+            tab_lifecycle.call_hook(widget, "restoreTabState", state)
+            logger.info('[TAB RESTORE] {}'.format(routeKey))
+        except Exception as e:
+            logger.exception('[TAB RESTORE] {} 恢复失败: {}'.format(routeKey, e))
+
+    def registerTabRestorer(self, keyword: str, factory: callable):
+        """ 注册休眠标签页的页面工厂：factory(routeKey) 返回新建的页面控件 """
+        self.tabRestorers[keyword] = factory
+
+    def _restorerForRoute(self, routeKey: str):
+        return next((f for keyword, f in self.tabRestorers.items() if keyword in routeKey), None)
+
+    def _onTabOpened(self, routeKey: str, widget):
+        tab_lifecycle.call_hook(widget, "onTabOpened")
+        # 标签由插件在添加页面前后创建，等本轮事件处理完再监听
+        QTimer.singleShot(0, self._watchTabItems)
+
+    def _watchTabItems(self):
+        """ 鼠标悬停在标签上时才计算该标签页的内存占用 """
+        for item in self.tabBar.items:
+            item.installEventFilter(self)
+
+    def tabMemoryText(self, routeKey: str) -> str:
+        """ 标签页内存占用的说明文字 """
+        if self.hibernatedTabs.get(routeKey):
+            return '已休眠，状态保存在磁盘缓存中'
+        widget = self.showInterface.widgetForRoute(routeKey)
+        if widget is None:
+            return ''
+        report = tab_lifecycle.memory_report(widget)
+        if 'python' not in report:
+            return '内存约 {:.1f} MB'.format(report['total'] / 1024 / 1024)
+        return '内存估算约 {:.1f} MB\nPython 对象 {:.1f} MB，表格 {} 行约 {:.1f} MB，文本约 {:.1f} MB'.format(
+            report['total'] / 1024 / 1024, report['python'] / 1024 / 1024,
+            report['rows'], report['models'] / 1024 / 1024, report['text'] / 1024 / 1024)
+
+    def eventFilter(self, obj, e):
+        if e.type() == QEvent.Type.ToolTip and obj in self.tabBar.items:
+            text = self.tabMemoryText(obj.routeKey())
+            QToolTip.showText(e.globalPos(), '{}\n{}'.format(obj.text(), text) if text else obj.text(), obj)
+            return True
+        return super().eventFilter(obj, e)
 
     def registerPluginOpener(self, uniqueName: str, openFunc: callable):
         self.pluginOpenerMap[uniqueName] = openFunc
 
     def registerTabChangedHandler(self, keyword: str, handler: callable):
-        self.tabChangedHandlers[keyword] = handler
\ No newline at end of file
+        self.tabChangedHandlers[keyword] = handler
+        self.routeHandlers.clear()
+
+    def _handlersForRoute(self, routeKey: str):
+        """ routeKey 对应的插件回调；插件的 routeKey 为 "<UNIQUE_NAME> <uuid>"，按关键字匹配一次后缓存 """
+        handlers = self.routeHandlers.get(routeKey)
+        if handlers is None:
+            handlers = [handler for keyword, handler in self.tabChangedHandlers.items() if keyword in routeKey]
+            self.routeHandlers[routeKey] = handlers
+        return handlers
\ No newline at end of file
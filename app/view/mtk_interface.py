@@ -200,6 +200,7 @@ class MtkInterface(ScrollArea):
         #self.parent.tabBar.currentChanged.connect(self.parent.onTabChanged)
         #self.parent.tabBar.tabAddRequested.connect(self.parent.onTabAddRequested)
 
+        self.cards = {}
         self.__initWidget()
 
 
@@ -215,10 +216,15 @@ class MtkInterface(ScrollArea):
 
 
     def addCard(self, icon, title, content, UniqueName):
+        # 同一个UniqueName只创建一张卡片（按需加载的插件在导入后会再次调用addCard）
+        if UniqueName in self.cards:
+            return self.cards[UniqueName]
         card = AppCard(icon=icon, title=title, content=content, parent=self.scrollAreaWidgetContents, UniqueName=UniqueName, mainWindow=self.parent)
         #logger.info("[TOOL ADD] Adding Tool: {}".format(title))
         # 将card组件加入到设置好的滚动布局中
         self.expandLayout.addWidget(card)
+        self.cards[UniqueName] = card
+        return card
 
         #self.flowlayout.addWidget(card)
 
@@ -0,0 +1,206 @@
+# plugin_list.py
+"""
+插件市场列表的 model / delegate
+只有可见的行才会被绘制，图标在第一次绘制时才加载
+"""
+import os
+
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, QEvent, QSortFilterProxyModel, pyqtSignal
+from PyQt6.QtGui import QPixmap, QColor, QPainter, QFont
+from PyQt6.QtWidgets import QStyledItemDelegate
+
+from ..common.config import ROOTPATH
+
+# 插件索引中的图标路径相对于插件目录
+PLUGIN_DIR = os.path.join(ROOTPATH, "plugins")
+DEFAULT_LOGO = os.path.join(ROOTPATH, "app", "resource", "images", "logo.png")
+
+ROW_HEIGHT = 70
+ROW_SPACING = 6
+ICON_SIZE = 32
+BUTTON_SIZE = QSize(80, 30)
+
+
+class PluginListModel(QAbstractListModel):
+    """ Plugin index model """
+
+    PluginRole = Qt.ItemDataRole.UserRole + 1
+    ActionRole = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._plugins = []
+        self._rows = {}
+        self._states = {}
+        self._pixmaps = {}
+
+    def set_plugins(self, plugins, states=None):
+        """替换全部插件；states 为 {插件名: {"installed": bool, "has_update": bool}}"""
+        self.beginResetModel()
+        self._plugins = list(plugins)
+        self._rows = {p.get("name"): i for i, p in enumerate(self._plugins)}
+        self._states = {}
+        for name, state in (states or {}).items():
+            self._states[name] = dict(state)
+        self._pixmaps = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._plugins)
+
+    def plugins(self):
+        return self._plugins
+
+    def plugin(self, row):
+        return self._plugins[row]
+
+    def state(self, name):
+        return self._states.setdefault(name, {"installed": False, "has_update": False, "busy": ""})
+
+    def set_state(self, name, **kwargs):
+        """更新插件状态（installed / has_update / busy），并刷新对应的行"""
+        row = self._rows.get(name)
+        self.state(name).update(kwargs)
+        if row is not None:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [self.ActionRole])
+
+    def action_text(self, name):
+        state = self.state(name)
+        if state.get("busy"):
+            return state["busy"]
+        if state.get("installed"):
+            return "更新" if state.get("has_update") else "卸载"
+        return "安装"
+
+    def pixmap(self, plugin):
+        name = plugin.get("name")
+        if name not in self._pixmaps:
+            logo_path = os.path.join(PLUGIN_DIR, plugin.get("logo", ""))
+            if not plugin.get("logo") or not os.path.exists(logo_path):
+                logo_path = DEFAULT_LOGO
+            self._pixmaps[name] = QPixmap(logo_path).scaled(
+                ICON_SIZE, ICON_SIZE, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        return self._pixmaps[name]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+
+        plugin = self._plugins[index.row()]
+        name = plugin.get("name", "未知插件")
+        if role == Qt.ItemDataRole.DisplayRole:
+            return "基础工具包" if name == "tools" else name
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self.pixmap(plugin)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return plugin.get("description", "")
+        if role == self.PluginRole:
+            return plugin
+        if role == self.ActionRole:
+            return self.action_text(name)
+        return None
+
+
+class PluginItemDelegate(QStyledItemDelegate):
+    """ Paint a plugin row with its action button """
+
+    # 信号：点击了某一行的按钮（参数为视图中的 index）
+    actionClicked = pyqtSignal(QModelIndex)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT + ROW_SPACING)
+
+    def _row_rect(self, option):
+        return option.rect.adjusted(0, 0, 0, -ROW_SPACING)
+
+    def _button_rect(self, option):
+        rect = self._row_rect(option)
+        return QRect(
+            rect.right() - 12 - BUTTON_SIZE.width(),
+            rect.center().y() - BUTTON_SIZE.height() // 2,
+            BUTTON_SIZE.width(),
+            BUTTON_SIZE.height()
+        )
+
+    def paint(self, painter: QPainter, option, index):
+        plugin = index.data(PluginListModel.PluginRole)
+        rect = self._row_rect(option)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # 背景
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#f4f4f4"))
+        painter.drawRoundedRect(rect, 8, 8)
+
+        # 图标
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        icon_rect = QRect(rect.left() + 12, rect.center().y() - ICON_SIZE // 2, ICON_SIZE, ICON_SIZE)
+        painter.drawPixmap(icon_rect, pixmap)
+
+        # 名称和描述
+        button_rect = self._button_rect(option)
+        text_rect = QRect(icon_rect.right() + 12, rect.top() + 6,
+                          button_rect.left() - icon_rect.right() - 24, rect.height() - 12)
+        font = QFont(option.font)
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(QColor("#000000"))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, index.data())
+
+        font.setBold(False)
+        painter.setFont(font)
+        painter.setPen(QColor("#606060"))
+        desc = "{}\n作者：{}，版本：{}".format(
+            plugin.get("description", ""), plugin.get("author", "匿名"), plugin.get("version", "未知"))
+        desc_rect = text_rect.adjusted(0, option.fontMetrics.height() + 2, 0, 0)
+        painter.drawText(desc_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, desc)
+
+        # 按钮
+        action = index.data(PluginListModel.ActionRole)
+        if action == "更新":
+            painter.setBrush(QColor("#ff9800"))
+            painter.setPen(Qt.PenStyle.NoPen)
+            text_color = QColor("#ffffff")
+        else:
+            painter.setBrush(QColor("#ffffff"))
+            painter.setPen(QColor("#d0d0d0"))
+            text_color = QColor("#000000")
+        painter.drawRoundedRect(button_rect, 5, 5)
+        painter.setPen(text_color)
+        painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, action)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if self._button_rect(option).contains(event.position().toPoint()):
+                self.actionClicked.emit(index)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class PluginFilterProxyModel(QSortFilterProxyModel):
+    """ Filter and rank plugins by search score """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # {源模型行号: 得分}，None 表示不过滤、保持索引原顺序
+        self._scores = None
+
+    def set_scores(self, scores):
+        self._scores = scores
+        self.invalidateFilter()
+        if scores is None:
+            self.sort(-1)
+        else:
+            self.sort(0, Qt.SortOrder.DescendingOrder)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self._scores is None or source_row in self._scores
+
+    def lessThan(self, left, right):
+        # 得分相同时保持索引中的顺序（降序排序，所以行号取负）
+        return (self._scores.get(left.row(), 0), -left.row()) < (self._scores.get(right.row(), 0), -right.row())
@@ -0,0 +1,377 @@
+import os
+import json
+import time
+
+import requests
+import zipfile
+import io
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QListView, QAbstractItemView
+from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from qfluentwidgets import (
+    SearchLineEdit, BodyLabel, SubtitleLabel, PushButton,
+    InfoBar, InfoBarPosition, FluentIcon as FIF, FluentIconBase
+)
+
+from loguru import logger
+from ..common.config import ROOTPATH
+from ..common.signal_bus import signalBus
+from ..common.plugin_download import InstallScheduler
+from ..common.plugin_loader import load_plugin
+from ..common.plugin_search import PluginSearchIndex
+from .plugin_list import PluginListModel, PluginItemDelegate, PluginFilterProxyModel
+
+def compare_versions(v1, v2):
+    """Compare semantic versions. Return True if v1 != v2."""
+    return v1.strip().lower() != v2.strip().lower()
+
+def check_plugin_update_status(plugin_dir, plugin):
+    """Check if installed plugin is outdated."""
+    name = plugin.get("name")
+    latest_version = plugin.get("version", "")
+
+    if name == "tools":
+        plugin_path = os.path.join(ROOTPATH, "tools", "metadata.json")
+    else:
+        plugin_path = os.path.join(plugin_dir, name, "metadata.json")
+
+    local_version = read_local_version(plugin_path)
+    if local_version is None:
+        return False  # Not installed
+    return compare_versions(latest_version, local_version)
+
+# metadata.json 路径 -> (mtime, 版本号)，文件未修改时不再重新解析
+_version_cache = {}
+
+def read_local_version(meta_path):
+    """读取已安装插件的版本号，未安装或无法解析时返回 None"""
+    try:
+        mtime = os.stat(meta_path).st_mtime_ns
+    except OSError:
+        return None
+
+    cached = _version_cache.get(meta_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            version = json.load(f).get("version", "")
+    except Exception:
+        return None
+    _version_cache[meta_path] = (mtime, version)
+    return version
+
+class PluginStatusScanner(QThread):
+    """后台一次性扫描所有插件的安装/更新状态"""
+
+    # 信号：({插件名: {"installed": bool, "has_update": bool}})，分批发出
+    statusReady = pyqtSignal(dict)
+
+    BATCH_SIZE = 16
+
+    def __init__(self, plugin_dir, base_tools_dir, plugins, parent=None):
+        super().__init__(parent)
+        self.plugin_dir = plugin_dir
+        self.base_tools_dir = base_tools_dir
+        self.plugins = [dict(p) for p in plugins]
+
+    def run(self):
+        # 一次列出插件目录，代替每个插件单独 os.path.exists
+        try:
+            installed = {e.name for e in os.scandir(self.plugin_dir) if e.is_dir()}
+        except OSError:
+            installed = set()
+        tools_installed = os.path.isdir(self.base_tools_dir)
+
+        batch = {}
+        for plugin in self.plugins:
+            name = plugin.get("name", "")
+            if name == "tools":
+                is_installed = tools_installed
+                meta_path = os.path.join(self.base_tools_dir, "metadata.json")
+            else:
+                is_installed = name in installed
+                meta_path = os.path.join(self.plugin_dir, name, "metadata.json")
+
+            has_update = False
+            if is_installed:
+                local_version = read_local_version(meta_path)
+                if local_version is not None:
+                    has_update = compare_versions(plugin.get("version", ""), local_version)
+
+            batch[name] = {"installed": is_installed, "has_update": has_update}
+            if len(batch) >= self.BATCH_SIZE:
+                self.statusReady.emit(batch)
+                batch = {}
+
+        if batch:
+            self.statusReady.emit(batch)
+
+class PluginMarket(QWidget):
+    def __init__(self, plugin_dir: str, parent=None):
+        super().__init__(parent)
+        self.setObjectName("plugin-market")
+        self.plugin_dir = plugin_dir
+        self.all_plugins = []
+        self.search_index = PluginSearchIndex()
+        self.status_scanner = None
+        # 本次运行中卸载过的插件，卡片要到重启后才移除，重新安装时不再重复添加
+        self.uninstalled_plugins = set()
+        # Define the base tool directory if needed
+        self.base_tools_dir = os.path.join(ROOTPATH, "tools")
+
+        # 安装队列，多个插件可同时下载
+        self.scheduler = InstallScheduler(parent=self)
+        self.scheduler.progressChanged.connect(self._on_install_progress)
+        self.scheduler.extractProgressChanged.connect(self._on_extract_progress)
+        self.scheduler.installSuccess.connect(self._on_install_success)
+        self.scheduler.installFailed.connect(self._on_install_failed)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(32, 20, 32, 20)
+        layout.setSpacing(12)
+
+        layout.addWidget(SubtitleLabel("🛒 插件市场", self))
+
+        # 增加一行提示，提示内容为：安装插件后，必须重启软件才能生效！
+        layout.addWidget(BodyLabel("在这里你可以浏览和安装各种插件，提升软件功能！\n提醒：所有插件使用前必须先安装一下基础工具包Tools", self))
+        self.search_bar = SearchLineEdit(self)
+        self.search_bar.setPlaceholderText("搜索插件...")
+        # 输入停顿后再搜索
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(lambda: self.filter_plugins(self.search_bar.text()))
+        self.search_bar.textChanged.connect(lambda _: self.search_timer.start())
+
+        self.install_all_button = PushButton("全部安装", self)
+        self.install_all_button.clicked.connect(self.install_all_plugins)
+        self.update_all_button = PushButton("全部更新", self)
+        self.update_all_button.clicked.connect(self.update_all_plugins)
+
+        toolbar = QHBoxLayout()
+        toolbar.addWidget(self.search_bar, 1)
+        toolbar.addWidget(self.install_all_button)
+        toolbar.addWidget(self.update_all_button)
+        layout.addLayout(toolbar)
+
+        # 插件列表：model / proxy / delegate，只绘制可见的行
+        self.model = PluginListModel(self)
+        self.proxy = PluginFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.delegate = PluginItemDelegate(self)
+        self.delegate.actionClicked.connect(self._on_action_clicked)
+
+        self.listView = QListView(self)
+        self.listView.setModel(self.proxy)
+        self.listView.setItemDelegate(self.delegate)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.listView.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.listView.setStyleSheet("QListView { background: transparent; border: none; }")
+        layout.addWidget(self.listView)
+
+        self.load_plugins()
+
+        # 后台更新到新的索引后直接刷新列表
+        signalBus.pluginIndexUpdated.connect(self.reload_plugins)
+
+    def reload_plugins(self):
+        logger.info("[插件管理器] 插件索引已更新，刷新插件市场")
+        self.load_plugins()
+
+    def load_plugins(self):
+        index_path = os.path.join(self.plugin_dir, "plugin_index.json")
+        if not os.path.exists(index_path):
+            InfoBar.error(
+                parent=self,
+                title="错误",
+                content="未找到 plugin_index.json，请前往设置界面点击更新按钮！",
+                position=InfoBarPosition.TOP,
+                duration=10000,
+                isClosable=True
+            )
+            return
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            self.all_plugins = json.load(f)
+
+        # 先按索引显示列表，安装状态由后台线程扫描后再填入
+        states = {}
+        for plugin in self.all_plugins:
+            if plugin.get("name") == "Base_Tools":
+                plugin["name"] = "tools"  # Base_Tools is a special case, we use "tools" as the name
+            # 正在安装的插件保留进度显示
+            busy = self.model.state(plugin["name"]).get("busy", "") if self.scheduler.is_queued(plugin["name"]) else "检测中"
+            states[plugin["name"]] = {"installed": False, "has_update": False, "busy": busy}
+
+        self.model.set_plugins(self.all_plugins, states)
+        self.search_index.build(self.all_plugins)
+        self.filter_plugins(self.search_bar.text())
+        self.scan_plugin_status()
+
+    def scan_plugin_status(self):
+        if self.status_scanner is not None:
+            # 旧的扫描结果已经过期
+            self.status_scanner.statusReady.disconnect()
+        scanner = PluginStatusScanner(self.plugin_dir, self.base_tools_dir, self.all_plugins, self)
+        scanner.statusReady.connect(self._on_status_ready)
+        # 扫描结束后释放线程对象，避免每次刷新列表都留下一个 QThread
+        scanner.finished.connect(lambda: self._on_scan_finished(scanner))
+        scanner.finished.connect(scanner.deleteLater)
+        self.status_scanner = scanner
+        scanner.start()
+
+    def _on_scan_finished(self, scanner):
+        if self.status_scanner is scanner:
+            self.status_scanner = None
+
+    def _on_status_ready(self, statuses):
+        for name, status in statuses.items():
+            if self.scheduler.is_queued(name):
+                self.model.set_state(name, **status)
+            else:
+                self.model.set_state(name, busy="", **status)
+
+    def _on_action_clicked(self, index):
+        plugin = self.model.plugin(self.proxy.mapToSource(index).row())
+        state = self.model.state(plugin["name"])
+        if state.get("busy"):
+            return
+        if state.get("installed") and not state.get("has_update"):
+            self.uninstall_plugin(plugin["name"])
+        else:
+            self.install_plugin(plugin)
+
+    def install_all_plugins(self):
+        for plugin in self.all_plugins:
+            state = self.model.state(plugin["name"])
+            if not state.get("installed") and not state.get("busy") and plugin.get("zip_url"):
+                self.install_plugin(plugin)
+
+    def update_all_plugins(self):
+        outdated = [p for p in self.all_plugins
+                    if self.model.state(p["name"]).get("installed") and self.model.state(p["name"]).get("has_update")]
+        if not outdated:
+            InfoBar.success(
+                parent=self,
+                title="提示",
+                content="所有已安装的插件都是最新版本",
+                position=InfoBarPosition.TOP,
+                duration=3000,
+                isClosable=True
+            )
+            return
+        for plugin in outdated:
+            self.install_plugin(plugin)
+
+    def filter_plugins(self, text):
+        self.proxy.set_scores(self.search_index.search(text))
+
+    def uninstall_plugin(self, name):
+        try:
+            import shutil
+            if name == "tools":
+                # Base_Tools is a special case, we remove the base tools directory
+                shutil.rmtree(self.base_tools_dir)
+            else:
+                shutil.rmtree(os.path.join(self.plugin_dir, name))
+            InfoBar.success(
+                parent=self,
+                title="成功",
+                content=f"插件『{name}』已卸载，插件卡片在重启软件后移除",
+                position=InfoBarPosition.TOP,
+                duration=10000,
+                isClosable=True
+            )
+            self.model.set_state(name, installed=False, has_update=False)
+            self.uninstalled_plugins.add(name)
+            logger.success("[插件管理器] 插件 {} 卸载成功", name)
+        except Exception as e:
+            InfoBar.error(
+                parent=self,
+                title="卸载失败",
+                content=str(e),
+                position=InfoBarPosition.TOP,
+                duration=10000,
+                isClosable=True
+            )
+            logger.error("[插件管理器] 插件 {} 卸载失败: {}", name, e)
+
+    def install_plugin(self, plugin):
+        name = plugin.get("name", "unknown")
+        zip_url = plugin.get("zip_url", "")
+
+        logger.info("[插件管理器] 开始安装插件: {}", name)
+        try:
+            if zip_url:
+                if name == "tools":
+                    queued = self.scheduler.submit(plugin, ROOTPATH)
+                else:
+                    queued = self.scheduler.submit(plugin, self.plugin_dir)
+                if queued:
+                    self.model.set_state(name, busy="等待中")
+
+            else:
+                os.makedirs(os.path.join(self.plugin_dir, name), exist_ok=True)
+                with open(os.path.join(self.plugin_dir, name, "metadata.json"), "w", encoding="utf-8") as f:
+                    json.dump(plugin, f, indent=2)
+                with open(os.path.join(self.plugin_dir, name, "plugin.py"), "w", encoding="utf-8") as f:
+                    f.write("# TODO: implement register(main_window)\n")
+                self.model.set_state(name, installed=True, has_update=False)
+        except Exception as e:
+            InfoBar.error(
+                parent=self,
+                title="安装失败",
+                content=str(e),
+                position=InfoBarPosition.TOP
+            )
+            logger.error("[插件管理器] 插件 {} 安装失败: {}", name, e)
+
+    def _get_plugin_by_name(self, name):
+        for p in self.all_plugins:
+            if p.get("name") == name:
+                return p
+        return None
+
+    def _on_install_progress(self, name, percent):
+        self.model.set_state(name, busy=f"{percent}%")
+
+    def _on_extract_progress(self, name, percent):
+        self.model.set_state(name, busy=f"解压 {percent}%")
+
+    def _on_install_success(self, plugin):
+        name = plugin['name']
+        if self.model.state(name).get("installed"):
+            # 按需加载的插件在第一次打开时才导入，已经打开过的插件要重启后才使用新版本
+            content = f"插件『{name}』已更新，已打开过的插件在重启软件后使用新版本"
+        elif name == "tools" or name in self.uninstalled_plugins:
+            content = f"插件『{name}』安装成功"
+        else:
+            # 新安装的插件直接注册到主窗口，不需要重启
+            load_plugin(self.window(), name, os.path.join(self.plugin_dir, name))
+            content = f"插件『{name}』安装成功，已添加到工具页面"
+
+        InfoBar.success(
+            parent=self,
+            title="安装成功",
+            content=content,
+            position=InfoBarPosition.TOP,
+            duration=10000,
+            isClosable=True
+        )
+        logger.success("[插件管理器] 插件 {} 安装成功", plugin['name'])
+        self.model.set_state(plugin['name'], installed=True, has_update=False, busy="")
+
+    def _on_install_failed(self, name, error):
+        InfoBar.error(
+            parent=self,
+            title="安装失败",
+            content=f"插件『{name}』: {error}",
+            position=InfoBarPosition.TOP,
+            duration=10000,
+            isClosable=True
+        )
+        logger.error("[插件管理器] 插件 {} 安装失败: {}", name, error)
+        self.model.set_state(name, busy="")
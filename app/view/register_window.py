@@ -6,13 +6,21 @@ from PyQt6.QtWidgets import QWidget, QApplication, QHBoxLayout, QVBoxLayout
 
 from qfluentwidgets import (MSFluentTitleBar, isDarkTheme, ImageLabel, BodyLabel, LineEdit,
                             PasswordLineEdit, PrimaryPushButton, HyperlinkButton, CheckBox, InfoBar,
-                            InfoBarPosition, setThemeColor)
+                            InfoBarPosition, setThemeColor, IndeterminateProgressRing)
 from ..common import resource
-from ..common.license_service import LicenseService
+from ..common.license_service import LicenseService, LicenseValidator
 from ..common.config import cfg
+from ..common.startup_profiler import startupProfiler
 from .main_window import MainWindow
 from ..common.logging import *
 
+# 登录界面显示后多久开始预先构建主窗口（毫秒），先让登录界面完成首次绘制
+PREBUILD_DELAY = 200
+# 登录界面和主窗口的主题色
+LOGIN_THEME_COLOR = '#28afe9'
+MAIN_THEME_COLOR = '#009faa'
+
+
 def isWin11():
     return sys.platform == 'win32' and sys.getwindowsversion().build >= 22000
 
@@ -28,9 +36,12 @@ class RegisterWindow(Window):
 
     def __init__(self, parent=None):
         super().__init__(parent=parent)
-        setThemeColor('#28afe9')
+        setThemeColor(LOGIN_THEME_COLOR)
         self.setTitleBar(MSFluentTitleBar(self))
         self.register = LicenseService()
+        self.validator = None
+        self.mainWindow = None
+        self._buildSteps = []
 
         self.imageLabel = ImageLabel(':/app/images/background.jpg', self)
         self.iconLabel = ImageLabel(':/app/images/logo.png', self)
@@ -44,17 +55,25 @@ class RegisterWindow(Window):
         self.rememberCheckBox = CheckBox(self.tr('Remember me'), self)
 
         self.loginButton = PrimaryPushButton(self.tr('Login'), self)
+        self.spinner = IndeterminateProgressRing(self)
 
         self.hBoxLayout = QHBoxLayout(self)
         self.vBoxLayout = QVBoxLayout()
 
         self.__initWidgets()
 
+        # 用户输入凭据期间，在空闲时间里分步构建主窗口
+        QTimer.singleShot(PREBUILD_DELAY, self._startPrebuild)
+
     def __initWidgets(self):
         self.titleBar.maxBtn.hide()
         self.titleBar.setDoubleClickEnabled(False)
         self.rememberCheckBox.setChecked(cfg.get(cfg.rememberMe))
 
+        self.spinner.setFixedSize(24, 24)
+        self.spinner.setStrokeWidth(3)
+        self.spinner.hide()
+
         self.emailLineEdit.setPlaceholderText('example@example.com')
         self.passwordLineEdit.setPlaceholderText('••••••••••••')
 
@@ -118,7 +137,9 @@ class RegisterWindow(Window):
         self.vBoxLayout.addWidget(self.rememberCheckBox)
         self.vBoxLayout.addSpacing(15)
         self.vBoxLayout.addWidget(self.loginButton)
-        self.vBoxLayout.addSpacing(30)
+        self.vBoxLayout.addSpacing(12)
+        self.vBoxLayout.addWidget(self.spinner, 0, Qt.AlignmentFlag.AlignHCenter)
+        self.vBoxLayout.addSpacing(18)
         self.vBoxLayout.addStretch(1)
 
     def __connectSignalToSlot(self):
@@ -128,8 +149,25 @@ class RegisterWindow(Window):
 
     def _login(self):
         code = self.passwordLineEdit.text().strip()
+        email = self.emailLineEdit.text()
+
+        # 这组凭据之前已验证通过时跳过 bcrypt
+        if self.register.check_token(cfg.get(cfg.licenseToken), code, email):
+            self._onValidateFinished(True, cfg.get(cfg.licenseToken))
+            return
 
-        if not self.register.validate(code, self.emailLineEdit.text()):
+        self._setInputEnabled(False)
+        self.spinner.show()
+        self.validator = LicenseValidator(self.register, code, email, self)
+        self.validator.validateFinished.connect(self._onValidateFinished)
+        self.validator.start()
+
+    def _onValidateFinished(self, ok: bool, token: str):
+        self.spinner.hide()
+        code = self.passwordLineEdit.text().strip()
+
+        if not ok:
+            self._setInputEnabled(True)
             InfoBar.error(
                 self.tr("Login failed"),
                 self.tr('Please check your password and email address again'),
@@ -148,13 +186,43 @@ class RegisterWindow(Window):
             if cfg.get(cfg.rememberMe):
                 cfg.set(cfg.email, self.emailLineEdit.text().strip())
                 cfg.set(cfg.password, code)
+            cfg.set(cfg.licenseToken, token)
 
             self.loginButton.setDisabled(True)
             QTimer.singleShot(1500, self._showMainWindow)
 
+    def _setInputEnabled(self, enabled: bool):
+        """ 验证期间禁止修改凭据 """
+        self.loginButton.setEnabled(enabled)
+        self.emailLineEdit.setEnabled(enabled)
+        self.passwordLineEdit.setEnabled(enabled)
+
+    def _startPrebuild(self):
+        if self.mainWindow is not None:
+            return
+        with startupProfiler.span("MainWindow.__init__ (prebuild)"):
+            self.mainWindow = MainWindow(prebuild=True)
+        self._buildSteps = self.mainWindow.buildSteps()
+        QTimer.singleShot(0, self._prebuildNext)
+
+    def _prebuildNext(self):
+        """ 每次事件循环只执行一步，两步之间登录界面可以处理输入和绘制 """
+        if self._buildSteps and not self._buildSteps[0]():
+            self._buildSteps.pop(0)
+        if self._buildSteps:
+            QTimer.singleShot(0, self._prebuildNext)
+
     def _showMainWindow(self):
+        # 登录得比预先构建快时，同步完成剩余的步骤
+        self._startPrebuild()
+        while self._buildSteps:
+            if not self._buildSteps[0]():
+                self._buildSteps.pop(0)
+
         self.close()
-        setThemeColor('#009faa')
+        # 登录界面隐藏后再切换主题色，避免登录界面在预先构建期间变色
+        setThemeColor(MAIN_THEME_COLOR)
 
-        w = MainWindow()
-        w.show()
+        with startupProfiler.span("MainWindow.reveal"):
+            self.mainWindow.reveal()
+        startupProfiler.save()
@@ -0,0 +1,82 @@
+# coding: utf-8
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFont
+from qfluentwidgets import PlainTextEdit
+
+from ..common.task_engine import Task
+
+# 刷新间隔（毫秒），约 30 帧每秒
+FRAME_INTERVAL = 33
+# 控制台最多保留的行数，更早的行被自动删除
+MAX_BLOCKS = 50000
+
+
+class TaskConsole(PlainTextEdit):
+    """ Read-only console that shows the output of a task engine task """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(MAX_BLOCKS)
+        self.setLineWrapMode(PlainTextEdit.LineWrapMode.NoWrap)
+        self.setFont(QFont("Consolas", 9))
+
+        self.task = None
+        # 输出按帧合并后一次性追加，不为每一行刷新界面
+        self.frameTimer = QTimer(self)
+        self.frameTimer.setInterval(FRAME_INTERVAL)
+        self.frameTimer.timeout.connect(self.flush)
+
+    def attach(self, task: Task, clear: bool = True):
+        """ 显示 task 的输出，替换之前关联的任务 """
+        self.detach()
+        if clear:
+            self.clear()
+        self.task = task
+        task.outputReady.connect(self._onOutputReady)
+        task.finished.connect(self._onFinished)
+        self._onOutputReady()
+
+    def detach(self):
+        if self.task is None:
+            return
+        self.flush()
+        try:
+            self.task.outputReady.disconnect(self._onOutputReady)
+            self.task.finished.disconnect(self._onFinished)
+        except TypeError:
+            pass
+        self.task = None
+        self.frameTimer.stop()
+
+    def flush(self):
+        """ 把缓冲区中的输出追加到控制台；缓冲区为空时停止刷新，直到有新的输出 """
+        if self.task is None:
+            self.frameTimer.stop()
+            return
+        lines, dropped = self.task.takeOutput()
+        if not lines and not dropped:
+            self.frameTimer.stop()
+            return
+
+        if dropped:
+            lines.insert(0, "…… 输出过快，省略了 {} 行，完整输出见 {}".format(dropped, self.task.outputPath))
+
+        # 只有在已经滚动到底部时才跟随新的输出
+        scrollBar = self.verticalScrollBar()
+        follow = scrollBar.value() >= scrollBar.maximum()
+        self.appendPlainText("\n".join(lines))
+        if follow:
+            scrollBar.setValue(scrollBar.maximum())
+
+    def _onOutputReady(self):
+        if not self.frameTimer.isActive():
+            self.frameTimer.start()
+
+    def _onFinished(self, state: str):
+        if self.task is None:
+            return
+        self.flush()
+        self.appendPlainText("—— 任务结束: {}，耗时 {:.1f}s，完整输出: {}".format(
+            state, self.task.elapsed(), self.task.outputPath))
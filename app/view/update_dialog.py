@@ -158,7 +158,7 @@ class CheckUpdateMessageBox(MessageBoxBase):
     
     def _start_check(self):
         """开始检查更新"""
-        self.updater.check_update(callback=self._on_check_finished)
+        self.updater.check_update(callback=self._on_check_finished, force=True)
     
     def _on_check_finished(self, success: bool, *args):
         """检查完成"""
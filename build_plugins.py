@@ -0,0 +1,187 @@
+# coding: utf-8
+"""
+增量打包插件并重新生成插件索引
+使用方法: python build_plugins.py [插件名 ...] [--force]
+例如: python build_plugins.py              # 只重新打包有改动的插件
+      python build_plugins.py NOC_Debug    # 只检查指定的插件
+      python build_plugins.py --force      # 全部重新打包
+
+插件源码放在 plugin_src/<插件名>，与运行时的安装目录 plugins/ 分开，
+避免随程序发布或被插件索引包带到用户的插件目录中
+打包时跳过 __pycache__ 和 .pyc，输出到 release/<插件名>.zip 和 release/<插件名>.manifest.json，
+并把压缩包的大小、SHA-256 和文件清单地址写回 plugins/plugin_index.json，最后重新生成 release/plugins.zip
+release/plugins.zip 只包含插件索引和插件图标；.github/workflows/plugins-zip.yml 也是调用本脚本打包
+"""
+import os
+import sys
+import json
+import hashlib
+from pathlib import Path
+
+from release import write_deterministic_zip, write_hash_manifest
+
+PLUGIN_DIR = Path("plugins")
+SOURCE_DIR = Path("plugin_src")
+RELEASE_DIR = Path("release")
+INDEX_FILE = PLUGIN_DIR / "plugin_index.json"
+# 记录上一次打包时源码和压缩包的状态，用来判断哪些插件需要重新打包
+STATE_FILE = RELEASE_DIR / ".plugin_build_state.json"
+
+# 不打包的目录和文件：编译缓存，以及插件下载器在安装目录中生成的文件清单和临时目录
+SKIP_DIRS = {"__pycache__", ".delta-staging"}
+SKIP_FILES = {".manifest.json"}
+SKIP_SUFFIXES = (".pyc", ".pyo")
+
+def source_dir(name):
+    """插件源码目录"""
+    return SOURCE_DIR / name
+
+def collect_files(src, prefix=""):
+    """返回 [(压缩包内路径, 文件路径), ...]"""
+    entries = []
+    for root, dirs, files in os.walk(src):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for file in files:
+            if file in SKIP_FILES or file.endswith(SKIP_SUFFIXES):
+                continue
+            path = Path(root) / file
+            entries.append((prefix + path.relative_to(src).as_posix(), path))
+    return entries
+
+def fingerprint(entries):
+    """按文件路径、大小和修改时间计算的指纹，不需要读取文件内容"""
+    h = hashlib.sha256()
+    for arcname, path in sorted(entries, key=lambda e: e[0]):
+        st = path.stat()
+        h.update(f"{arcname}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def load_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def save_json(path, data, indent=2):
+    """内容没有变化时不重写文件，避免修改时间变化导致 plugins.zip 被重新打包"""
+    text = json.dumps(data, indent=indent, ensure_ascii=False) + "\n"
+    try:
+        if Path(path).read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    Path(str(path) + ".tmp").write_text(text, encoding="utf-8")
+    os.replace(str(path) + ".tmp", path)
+
+def lfs_pointer_info(path):
+    """Git LFS 指针文件中记录的实际文件大小和 SHA-256，不是指针文件时返回 None"""
+    if path.stat().st_size > 1024:
+        return None
+    fields = dict(line.split(" ", 1) for line in path.read_text(encoding="utf-8", errors="ignore").splitlines() if " " in line)
+    if not fields.get("version", "").startswith("https://git-lfs.github.com/spec/") or not fields.get("oid", "").startswith("sha256:"):
+        return None
+    return int(fields["size"]), fields["oid"][len("sha256:"):]
+
+def zip_info(zip_path, state):
+    """压缩包的大小和 SHA-256；压缩包自上次记录以来没有变化时不重新计算哈希"""
+    # 没有拉取 LFS 对象时仓库中只有指针文件，使用指针中记录的信息
+    pointer = lfs_pointer_info(zip_path)
+    if pointer:
+        return pointer
+    st = zip_path.stat()
+    if state.get("zip_size") != st.st_size or state.get("zip_mtime") != st.st_mtime_ns or not state.get("sha256"):
+        state.update(zip_size=st.st_size, zip_mtime=st.st_mtime_ns, sha256=file_sha256(zip_path))
+    return st.st_size, state["sha256"]
+
+def build_plugin(plugin, state, force):
+    """必要时重新打包单个插件并更新索引条目，返回是否重新打包"""
+    name = plugin["name"]
+    src = source_dir(name)
+    zip_path = RELEASE_DIR / f"{name}.zip"
+    rebuilt = False
+
+    if not src.is_dir():
+        print(f"  - {name}: 找不到源码目录 {src}，保留现有的压缩包")
+    else:
+        entries = collect_files(src)
+        fp = fingerprint(entries)
+        if force or fp != state.get("fingerprint") or not zip_path.exists():
+            # 源码中的 metadata.json 是版本号的来源
+            meta = load_json(src / "metadata.json", {})
+            if meta.get("version"):
+                plugin["version"] = meta["version"]
+            hashes = write_deterministic_zip(zip_path, entries)
+            write_hash_manifest(RELEASE_DIR / f"{name}.manifest.json", name, plugin.get("version", ""), hashes)
+            state["fingerprint"] = fp
+            rebuilt = True
+            print(f"  ✓ {name}: 已重新打包（{len(entries)} 个文件）")
+        else:
+            print(f"  · {name}: 没有改动")
+
+    if zip_path.exists():
+        plugin["size"], plugin["sha256"] = zip_info(zip_path, state)
+        if (RELEASE_DIR / f"{name}.manifest.json").exists() and plugin.get("zip_url", "").endswith(".zip"):
+            plugin["manifest_url"] = plugin["zip_url"][:-len(".zip")] + ".manifest.json"
+    return rebuilt
+
+def build_index_package(state, force):
+    """重新生成 release/plugins.zip：插件索引和插件图标"""
+    entries = [(INDEX_FILE.name, INDEX_FILE)]
+    entries += collect_files(PLUGIN_DIR / "plugin_resources", "plugin_resources/")
+    fp = fingerprint(entries)
+    zip_path = RELEASE_DIR / "plugins.zip"
+    if force or fp != state.get("fingerprint") or not zip_path.exists():
+        write_deterministic_zip(zip_path, entries)
+        state["fingerprint"] = fp
+        print(f"  ✓ plugins.zip: 已重新打包（{len(entries)} 个文件）")
+    else:
+        print("  · plugins.zip: 没有改动")
+
+def main():
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    force = "--force" in sys.argv
+
+    print("="*60)
+    print("OneMore 插件增量打包工具")
+    print("="*60)
+
+    index = load_json(INDEX_FILE, None)
+    if index is None:
+        print(f"错误: 找不到 {INDEX_FILE}")
+        sys.exit(1)
+    unknown = set(args) - {p["name"] for p in index}
+    if unknown:
+        print(f"错误: 插件索引中没有这些插件: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+
+    RELEASE_DIR.mkdir(exist_ok=True)
+    state = load_json(STATE_FILE, {})
+
+    print("\n[1/2] 检查插件源码...")
+    rebuilt = []
+    for plugin in index:
+        if args and plugin["name"] not in args:
+            continue
+        if build_plugin(plugin, state.setdefault(plugin["name"], {}), force):
+            rebuilt.append(plugin["name"])
+    save_json(INDEX_FILE, index)
+
+    print("\n[2/2] 生成插件索引包...")
+    build_index_package(state.setdefault("plugins.zip", {}), force)
+    save_json(STATE_FILE, state, indent=1)
+
+    print("\n" + "="*60)
+    print(f"✅ 完成，重新打包了 {len(rebuilt)} 个插件" + (f": {', '.join(rebuilt)}" if rebuilt else ""))
+    print("="*60)
+    print("请提交 release/ 下有变化的文件和 plugins/plugin_index.json")
+
+if __name__ == '__main__':
+    main()
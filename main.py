@@ -7,8 +7,17 @@ from PyQt6.QtGui import QFont
 from PyQt6.QtWidgets import QApplication
 from qfluentwidgets import FluentTranslator
 
-from app.common.config import cfg
-from app.view.register_window import RegisterWindow
+from app.common.startup_profiler import startupProfiler
+
+# 启动耗时分析模式
+if "--profile-startup" in sys.argv:
+    startupProfiler.enable()
+
+with startupProfiler.span("import app.common.config (qconfig.load)"):
+    from app.common.config import cfg
+with startupProfiler.span("import app.view.register_window"):
+    from app.view.register_window import RegisterWindow
+from app.common.task_engine import taskEngine
 
 
 # 设置根目录
@@ -20,11 +29,31 @@ if "--update-helper" in sys.argv:
     try:
         idx = sys.argv.index("--update-helper")
         update_file = sys.argv[idx + 1] if len(sys.argv) > idx + 1 else ""
+        parent_pid = None
+        if "--parent-pid" in sys.argv:
+            pid_idx = sys.argv.index("--parent-pid")
+            if len(sys.argv) > pid_idx + 1 and sys.argv[pid_idx + 1].isdigit():
+                parent_pid = int(sys.argv[pid_idx + 1])
         from app.common.app_updater import AppUpdater
-        AppUpdater.run_update_helper(update_file)
+        AppUpdater.run_update_helper(update_file, parent_pid)
     finally:
         sys.exit(0)
 
+# rollback mode: restore a snapshot from backup/<timestamp>
+if "--rollback" in sys.argv:
+    try:
+        idx = sys.argv.index("--rollback")
+        timestamp = sys.argv[idx + 1] if len(sys.argv) > idx + 1 else ""
+        from app.common.app_updater import AppUpdater
+        AppUpdater.rollback(timestamp)
+    except Exception as e:
+        # 回滚失败时输出原因并以非零状态退出，方便脚本判断
+        import traceback
+        traceback.print_exc()
+        print(f"回滚失败: {e}")
+        sys.exit(1)
+    sys.exit(0)
+
 # 启动时清理更新残留文件
 try:
     import shutil
@@ -46,15 +75,23 @@ app.setAttribute(Qt.ApplicationAttribute.AA_DontCreateNativeWidgetSiblings)
 
 # internationalization
 locale = cfg.get(cfg.language).value
-translator = FluentTranslator(locale)
-galleryTranslator = QTranslator()
-galleryTranslator.load(locale, "app", ".", ":/app/i18n")
+with startupProfiler.span("install translators"):
+    translator = FluentTranslator(locale)
+    galleryTranslator = QTranslator()
+    galleryTranslator.load(locale, "app", ".", ":/app/i18n")
 
-app.installTranslator(translator)
-app.installTranslator(galleryTranslator)
+    app.installTranslator(translator)
+    app.installTranslator(galleryTranslator)
 
 # create main window
-w = RegisterWindow()
+with startupProfiler.span("RegisterWindow.__init__"):
+    w = RegisterWindow()
 w.show()
 
 app.exec()
+
+# 结束仍在运行的插件任务及其子进程
+taskEngine.shutdown()
+
+# 未登录直接退出时也输出已记录的阶段
+startupProfiler.save()
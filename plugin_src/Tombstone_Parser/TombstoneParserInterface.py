@@ -0,0 +1,751 @@
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QWidget, QVBoxLayout
+from qfluentwidgets import CardWidget
+import sys
+from pathlib import Path
+import os
+import subprocess
+from datetime import datetime
+import time
+import re
+
+from PyQt6.QtCore import Qt, QPoint, QSize, QUrl, QRect, QPropertyAnimation, pyqtSignal, QObject
+from PyQt6.QtGui import QIcon, QFont, QColor, QPainter
+from PyQt6.QtWidgets import QApplication, QHBoxLayout, QVBoxLayout, QGraphicsOpacityEffect, QFileDialog, QMessageBox
+
+from qfluentwidgets import (CardWidget, setTheme, Theme, IconWidget, BodyLabel, CaptionLabel, PushButton,
+                            TransparentToolButton, FluentIcon, RoundMenu, Action, ElevatedCardWidget,
+                            ImageLabel, isDarkTheme, FlowLayout, MSFluentTitleBar, SimpleCardWidget,
+                            HeaderCardWidget, InfoBarIcon, HyperlinkLabel, HorizontalFlipView, EditableComboBox,
+                            PrimaryPushButton, TitleLabel, PillPushButton, setFont, ScrollArea,
+                            VerticalSeparator, MSFluentWindow, NavigationItemPosition, GroupHeaderCardWidget,
+                            ComboBox, SearchLineEdit, SubtitleLabel, StateToolTip, LineEdit, Flyout)
+
+from qfluentwidgets.components.widgets.acrylic_label import AcrylicBrush
+
+from app.common.config import ROOTPATH
+from app.common.logging import logger
+from app.common.task_engine import taskEngine, SUCCEEDED, CANCELLED
+from app.common.utils import linuxPath2winPath
+from app.view.task_console import TaskConsole
+
+TOOLS_PATH = os.path.join(ROOTPATH, 'tools')
+LLVMTOOL_PATH = os.path.join(TOOLS_PATH, "android-sdk", "bin")
+
+CURRENT_PLUGIN_DIR = os.path.dirname(__file__)
+# resource文件夹的路径, 位于当前文件的上两级目录
+resource_path = 'app/resource'
+
+# 缓存字典，用于存储已找到的so文件路径
+SO_CACHE = {}
+
+
+def isWin11():
+    return sys.platform == 'win32' and sys.getwindowsversion().build >= 22000
+
+
+if isWin11():
+    from qframelesswindow import AcrylicWindow as Window
+else:
+    from qframelesswindow import FramelessWindow as Window
+
+class StatisticsWidget(QWidget):
+    """ Statistics widget """
+
+    def __init__(self, title: str, value: str, parent=None):
+        super().__init__(parent=parent)
+        self.titleLabel = CaptionLabel(title, self)
+        self.valueLabel = BodyLabel(value, self)
+        self.vBoxLayout = QVBoxLayout(self)
+
+        self.vBoxLayout.setContentsMargins(16, 0, 16, 0)
+        self.vBoxLayout.addWidget(self.valueLabel, 0, Qt.AlignmentFlag.AlignTop)
+        self.vBoxLayout.addWidget(self.titleLabel, 0, Qt.AlignmentFlag.AlignBottom)
+
+        setFont(self.valueLabel, 18, QFont.Weight.DemiBold)
+        self.titleLabel.setTextColor(QColor(96, 96, 96), QColor(206, 206, 206))
+
+class AppInfoCard(SimpleCardWidget):
+    """ App information card """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.iconLabel = ImageLabel("{}".format(os.path.join(CURRENT_PLUGIN_DIR, "logo.png")), self)
+        self.iconLabel.setBorderRadius(8, 8, 8, 8)
+        self.iconLabel.scaledToWidth(120)
+
+        self.nameLabel = TitleLabel('Tombstone_Praser', self)
+        self.companyLabel = CaptionLabel('@Designed by charter.', self)
+        self.descriptionLabel = BodyLabel(
+            'Tombstone_Praser tool 是基于add2line工具集成的用于解析带有堆栈的crash log的通用工具', self)
+        self.descriptionLabel.setWordWrap(True)
+
+        self.tagButton = PillPushButton('addr2line', self)
+        self.tagButton.setCheckable(False)
+        setFont(self.tagButton, 12)
+        self.tagButton.setFixedSize(80, 32)
+
+        self.tagButton2 = PillPushButton('Tombstone', self)
+        self.tagButton2.setCheckable(False)
+        setFont(self.tagButton2, 12)
+        self.tagButton2.setFixedSize(80, 32)
+
+        #self.shareButton = TransparentToolButton(FluentIcon.SHARE, self)
+        #self.shareButton.setFixedSize(32, 32)
+        #self.shareButton.setIconSize(QSize(14, 14))
+
+        self.hBoxLayout = QHBoxLayout(self)
+        self.vBoxLayout = QVBoxLayout()
+        self.topLayout = QHBoxLayout()
+        self.statisticsLayout = QHBoxLayout()
+        self.buttonLayout = QHBoxLayout()
+
+        self.initLayout()
+        self.setBorderRadius(8)
+
+    def initLayout(self):
+        self.hBoxLayout.setSpacing(30)
+        self.hBoxLayout.setContentsMargins(34, 24, 24, 24)
+        self.hBoxLayout.addWidget(self.iconLabel)
+        self.hBoxLayout.addLayout(self.vBoxLayout)
+
+        self.vBoxLayout.setContentsMargins(0, 0, 0, 0)
+        self.vBoxLayout.setSpacing(0)
+
+        # name label and install button
+        self.vBoxLayout.addLayout(self.topLayout)
+        self.topLayout.setContentsMargins(0, 0, 0, 0)
+        self.topLayout.addWidget(self.nameLabel)
+        #self.topLayout.addWidget(self.installButton, 0, Qt.AlignmentFlag.AlignRight)
+
+        # company label
+        self.vBoxLayout.addSpacing(3)
+        self.vBoxLayout.addWidget(self.companyLabel)
+
+        # statistics widgets
+        self.vBoxLayout.addSpacing(20)
+        self.vBoxLayout.addLayout(self.statisticsLayout)
+        self.statisticsLayout.setContentsMargins(0, 0, 0, 0)
+        self.statisticsLayout.setSpacing(10)
+        self.statisticsLayout.setAlignment(Qt.AlignmentFlag.AlignLeft)
+
+        # description label
+        self.vBoxLayout.addSpacing(20)
+        self.vBoxLayout.addWidget(self.descriptionLabel)
+
+        # button
+        self.vBoxLayout.addSpacing(12)
+        self.buttonLayout.setContentsMargins(0, 0, 0, 0)
+        self.vBoxLayout.addLayout(self.buttonLayout)
+        self.buttonLayout.addWidget(self.tagButton, 0, Qt.AlignmentFlag.AlignLeft)
+        self.buttonLayout.addWidget(self.tagButton2, 1, Qt.AlignmentFlag.AlignLeft)
+        #self.buttonLayout.addWidget(self.shareButton, 0, Qt.AlignmentFlag.AlignRight)
+
+class DescriptionCard(HeaderCardWidget):
+    """ Description card """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.descriptionLabel = BodyLabel(
+            'Tombstone_Praser tool 是基于add2line工具集成的用于解析带有堆栈的crash log的通用工具。本软件内直接集成LLVM工具包，无需下载，直接选择symbols目录，再选择tombstone文件或目录进行解析即可！\n 解析步骤：\n'
+            '1. 选择带有符号表的symbols目录\n'
+            '2. 选择需要解析的tombstone文件或目录\n'
+            '3. 执行\n'
+            '4. 执行结束后，结果文件以"tombstone文件名+parser_result"命名\n'
+            '提示：解析的结果生成在同tombstone目录下', self)
+
+        self.descriptionLabel.setWordWrap(True)
+        self.viewLayout.addWidget(self.descriptionLabel)
+        self.setTitle('描述')
+        self.setBorderRadius(8)
+
+class SettinsCard(GroupHeaderCardWidget):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setTitle("基本设置")
+        self.setBorderRadius(8)
+
+        self.symbolsdir = ""
+        self.tombstonefile = ""
+        self.tombstonedir = ""
+
+        self.tombstone = ""
+        self.vendor_version = "t"
+        self.result_message = "" 
+        # 正在执行的解析任务（taskEngine）
+        self.task = None
+
+        # 选择按钮以及输入框部件
+        self.symbolschooseButton = PushButton("选择")
+        self.tombstonefilechooseButton = PushButton("选择")
+        self.tombstonedirchooseButton = PushButton("选择")
+
+        # 显示终端部件
+        #self.comboBox = ComboBox()
+        # 显示tombstone类型部件
+        self.tombstonecomboBox = ComboBox()
+        self.vendorcomboBox = ComboBox()
+
+        # 入口脚本部件
+        #self.lineEdit = LineEdit()
+
+        # 设置部件的固定宽度
+        self.symbolschooseButton.setFixedWidth(120)
+        self.tombstonefilechooseButton.setFixedWidth(120)
+        self.tombstonedirchooseButton.setFixedWidth(120)
+
+        # self.comboBox.setFixedWidth(320)
+        # self.comboBox.addItems(["始终显示", "始终隐藏"])
+        #选择文件/选择目录
+        self.tombstonecomboBox.setFixedWidth(320)
+        self.tombstonecomboBox.addItems(["选择文件", "选择目录"])
+        self.tombstonedirchooseButton.setEnabled(False)
+        self.tombstonecomboBox.currentIndexChanged.connect(self.on_combobox_changed)
+        #选择vendor版本
+        self.vendorcomboBox.setFixedWidth(320)
+        self.vendorcomboBox.addItems(["S", "T", "U", "V"])
+        self.vendorcomboBox.setCurrentText("T")
+        self.vendorcomboBox.currentIndexChanged.connect(self.on_vendorcombobox_changed)
+
+        # 底部运行按钮以及提示
+        self.hintIcon = IconWidget(InfoBarIcon.INFORMATION)
+        self.hintLabel = BodyLabel("点击运行按钮开始解析")
+        self.runButton = PrimaryPushButton(FluentIcon.PLAY_SOLID, "运行")
+        self.bottomLayout = QHBoxLayout()
+        # 设置底部工具栏布局
+        self.hintIcon.setFixedSize(16, 16)
+        self.bottomLayout.setSpacing(10)
+        self.bottomLayout.setContentsMargins(24, 15, 24, 20)
+        self.bottomLayout.addWidget(self.hintIcon, 0, Qt.AlignmentFlag.AlignLeft)
+        self.bottomLayout.addWidget(self.hintLabel, 0, Qt.AlignmentFlag.AlignLeft)
+        self.bottomLayout.addStretch(1)
+        self.bottomLayout.addWidget(self.runButton, 0, Qt.AlignmentFlag.AlignRight)
+        self.bottomLayout.setAlignment(Qt.AlignmentFlag.AlignVCenter)
+
+        # 设置状态提示
+        self.stateTooltip = None
+        self.bottomStateLayout = QHBoxLayout()
+        
+        # 设置底部状态布局
+        self.bottomStateLayout.setSpacing(10)
+        self.bottomStateLayout.setContentsMargins(24, 15, 24, 20)
+        self.bottomStateLayout.setAlignment(Qt.AlignmentFlag.AlignVCenter)
+        self.bottomStateLayout.addStretch(1)
+        #symbols目录（请选择目录）                                  选择
+        #tombstone类型（请选择需要解析单个文件还是整个目录下的文件）  （选择文件/选择目录）
+        #tombstone文件（请选择文件）                                选择
+        #tombstone目录（请选择目录）                                选择
+        #vendor版本（请选择vendor版本）                             （S/T/U/V）
+        self.symbolsgroup = self.addGroup("{}/images/Basketball.png".format(resource_path), "symbols目录", "请选择目录", self.symbolschooseButton)
+        self.addGroup("{}/images/Python.svg".format(resource_path), "tombstone类型", "请选择需要解析单个文件还是整个目录下的文件", self.tombstonecomboBox)
+        self.tombstonefilegroup = self.addGroup("{}/images/Rocket.svg".format(resource_path), "tombstone文件", "请选择文件", self.tombstonefilechooseButton)
+        self.tombstonedirgroup = self.addGroup("{}/images/Rocket.svg".format(resource_path), "tombstone目录", "请选择目录", self.tombstonedirchooseButton)
+        self.addGroup("{}/images/Joystick.svg".format(resource_path), "vendor版本", "请选择vendor版本", self.vendorcomboBox)
+        self.vBoxLayout.addLayout(self.bottomLayout)
+
+        # 解析输出控制台，第一次运行时显示
+        self.console = TaskConsole(self)
+        self.console.setFixedHeight(220)
+        self.console.hide()
+        self.consoleLayout = QHBoxLayout()
+        self.consoleLayout.setContentsMargins(24, 0, 24, 20)
+        self.consoleLayout.addWidget(self.console)
+        self.vBoxLayout.addLayout(self.consoleLayout)
+
+        self.symbolschooseButton.clicked.connect(self.onsymbolsChooseButtonClicked)
+        self.tombstonefilechooseButton.clicked.connect(self.ontombstonefileChooseButtonClicked)
+        self.tombstonedirchooseButton.clicked.connect(self.ontombstonedirChooseButtonClicked)
+        self.runButton.clicked.connect(self.onRunButtonClicked)
+
+    #选择目录/选择文件
+    def on_combobox_changed(self, index):
+        if index > 0:
+            self.tombstonefilechooseButton.setEnabled(False)
+            self.tombstonedirchooseButton.setEnabled(True)
+        else:
+            self.tombstonedirchooseButton.setEnabled(False)
+            self.tombstonefilechooseButton.setEnabled(True)
+    #选择vendor版本
+    def on_vendorcombobox_changed(self, index):
+        if index > 0:
+            self.vendor_version = "t"
+        else:
+            self.vendor_version = "s"
+
+    #错误提示
+    def showFileStyleErrorFlyout(self):
+        Flyout.create(
+            icon=InfoBarIcon.ERROR,
+            title='目录选择错误',
+            content="需要带有符号表的symbols, 请检查后再执行",
+            target=self.runButton,
+            parent=self.window()
+        )
+    def showNofileErrorFlyout(self):
+        Flyout.create(
+            icon=InfoBarIcon.ERROR,
+            title='dir is not choose',
+            content="目录未选择, 请检查后再执行",
+            target=self.runButton,
+            parent=self.window()
+        )
+
+    #symbols目录选择事件
+    def onsymbolsChooseButtonClicked(self):
+        logger.info("symbols Choose Button Clicked!")
+        self.symbolsdir = QFileDialog.getExistingDirectory(self, "选择文件夹")
+        # 转换为windows路径
+        self.symbolsdir = linuxPath2winPath(self.symbolsdir)
+        logger.info("symbols dir: {}".format(self.symbolsdir))
+
+        if self.symbolsdir == "":
+            self.symbolschooseButton.setText("选择")
+            self.symbolsgroup.setContent("请选择目录")
+        else:
+            self.symbolschooseButton.setText("已选择")
+            self.symbolsgroup.setContent(self.symbolsdir)
+    #tombstone文件选择事件
+    def ontombstonefileChooseButtonClicked(self):
+        logger.info("tombstonefile choose Button Clicked")
+        # 弹出windows文件选择框
+        self.tombstonefile, _ = QFileDialog.getOpenFileName(self, "选择文件", "C:/", "All Files (*);")
+        # 转化为windows路径
+        self.tombstonefile = linuxPath2winPath(self.tombstonefile)
+        # 打印选择的文件路径
+        logger.info("Choose executable File: {}".format(self.tombstonefile))
+
+        if self.tombstonefile == "":
+            # 设置vmlinuxButton的文字显示已选择
+            self.tombstonefilechooseButton.setText("选择")
+            self.tombstonefilegroup.setContent("请选择log文件")
+        else:
+            self.tombstonefilechooseButton.setText("已选择")
+            self.tombstonefilegroup.setContent(self.tombstonefile)
+            self.tombstone = self.tombstonefile
+    #tombstone目录选择事件
+    def ontombstonedirChooseButtonClicked(self):
+        logger.info("tombstonedir choose Button Clicked")
+        self.tombstonedir = QFileDialog.getExistingDirectory(self, "选择文件夹")
+        # 转换为windows路径
+        self.tombstonedir = linuxPath2winPath(self.tombstonedir)
+        logger.info("tombstone dir: {}".format(self.tombstonedir))
+
+        if self.tombstonedir == "":
+            self.tombstonedirchooseButton.setText("选择")
+            self.tombstonedirgroup.setContent("请选择目录")
+        else:
+            self.tombstonedirchooseButton.setText("已选择")
+            self.tombstonedirgroup.setContent(self.tombstonedir)
+            self.tombstone = self.tombstonedir
+
+    #运行事件
+    def onRunButtonClicked(self):
+        logger.info("run button clicked!")
+
+        if self.symbolsdir == "":
+            self.showNofileErrorFlyout()
+        else:
+            self.stateTooltip = StateToolTip('正在解析', '客官请耐心等待哦~~', self)
+            # 状态提示放到中心位置
+            self.bottomStateLayout.addWidget(self.stateTooltip, 0, Qt.AlignmentFlag.AlignRight)
+            self.vBoxLayout.addLayout(self.bottomStateLayout)
+            # 显示状态提示
+            self.stateTooltip.show()
+
+            # runbuton按钮设置为不可点击
+            self.runButton.setDisabled(True)
+
+            # if self.comboBox.currentText() == "始终显示":
+            #     shell = True
+            # else:
+            #     shell = False
+    
+            # if self.tombstonefile != "":
+            #     command = "{} -a -i -Cfe {} {}".format(linuxPath2winPath(os.path.join(LLVMTOOL_PATH, "llvm-addr2line.exe")), self.symbolsdir, self.tombstonefile)
+
+            # 解析交给任务引擎在后台执行，完成后在界面线程中回调 onParseFinished
+            self.task = taskEngine.submit(start_parse, name="Tombstone Parser",
+                                          args=(self.symbolsdir, self.tombstone, LLVMTOOL_PATH, self.vendor_version))
+            self.task.finished.connect(self.onParseFinished)
+            self.console.show()
+            self.console.attach(self.task)
+
+    def onParseFinished(self, state):
+        task, self.task = self.task, None
+        self.result_message = (task.result or "") if task is not None and state == SUCCEEDED else ""
+
+        if state == CANCELLED:
+            self.stateTooltip.close()
+            self.runButton.setDisabled(False)
+            return
+
+        if self.result_message != "":
+            if os.path.isdir(self.tombstone):
+                    try:
+                        subprocess.run(["explorer", self.tombstone])
+                    except Exception as e:
+                        QMessageBox.warning(self, "错误", f"打开文件夹时发生错误: {e}")
+            else:
+                directory = os.path.dirname(self.tombstone)
+                if os.path.isdir(directory):
+                    try:
+                        subprocess.run(["explorer", directory])
+                    except Exception as e:
+                        QMessageBox.warning(self, "错误", f"打开文件夹时发生错误: {e}")
+            self.stateTooltip.close()
+            self.stateTooltip2 = StateToolTip('解析完成', '为您打开生成目录~~', self)
+            self.bottomStateLayout.addWidget(self.stateTooltip2, 0, Qt.AlignmentFlag.AlignRight)
+            self.stateTooltip2.show()
+            self.runButton.setDisabled(False)
+        else:
+            self.stateTooltip.close()
+            self.stateTooltip2 = StateToolTip('错误', '结果不存在！', self)
+            self.bottomStateLayout.addWidget(self.stateTooltip2, 0, Qt.AlignmentFlag.AlignRight)
+            self.stateTooltip2.show()
+            self.runButton.setDisabled(False)
+
+#解析单个文件
+def parse_single_tomb(symbols_path, tomb_path, tools_dir, vendor_version, task=None):
+    result_name = os.path.join(os.path.dirname(tomb_path), os.path.basename(tomb_path) + "_parser_result.txt")
+    if task is not None:
+        task.write("解析: {}".format(tomb_path))
+    with open(tomb_path, 'r', encoding='utf-8') as fp, open(result_name, "w+") as f_result:
+        for line in fp:
+            # 任务被取消（例如关闭标签页）时停止解析
+            if task is not None and task.isCancelled():
+                break
+            rst_common = re.search(r'(#[0-9]{2})\s+pc\s+([0-9a-z]*)\s+(.+?)\s+', line)
+            rst_asan = re.search(r'(#[0-9]{1,2}).+\((.+?)\+([0-9a-z]*)\)', line)
+
+            so_path, address = "", ""
+            if rst_common:
+                so_path, address = rst_common.group(3), rst_common.group(2)
+            elif rst_asan:
+                so_path, address = rst_asan.group(2), rst_asan.group(3)
+
+            if so_path and address:
+                analysis_result = tomba_so(symbols_path, so_path, address, tools_dir, vendor_version)
+                f_result.write(line)
+                f_result.write(analysis_result)
+                f_result.write("\n")
+                if task is not None:
+                    task.write(line.rstrip("\n"))
+                    task.write(analysis_result.rstrip("\n"))
+            else:
+                f_result.write(line)
+    return result_name
+#解析目录下所有文件
+def parse_tomb_directory(symbols_path, tomb_dir, tools_dir, vendor_version, task=None):
+
+    result_files = []
+    for root, _, files in os.walk(tomb_dir):
+        for file in files:
+            if task is not None and task.isCancelled():
+                return result_files
+            tomb_path = os.path.join(root, file)
+            result_file = parse_single_tomb(symbols_path, tomb_path, tools_dir, vendor_version, task)
+            result_files.append(result_file)
+    return result_files
+
+#获取解析工具路径
+def get_tool_path(tool_name, tools_dir):
+    return os.path.join(tools_dir, tool_name)
+
+#addr2line解析so
+def tomba_so(symbols_path, so_path, address, tools_dir, vendor_version):
+    """解析单个so文件的地址信息（优化版）"""
+    # 规范化so_path：去除开头的'/'和可能的路径格式问题
+    so_path = so_path.lstrip('/')
+    
+    # 创建缓存键
+    cache_key = f"{symbols_path}:{so_path}"
+    
+    # 检查缓存
+    if cache_key in SO_CACHE:
+        so_full_path = SO_CACHE[cache_key]
+        if not (so_full_path and os.path.exists(so_full_path)):
+            so_full_path = None
+    else:
+        so_full_path = None
+        # 可能的查找路径模式
+        search_paths = [
+            os.path.join(symbols_path, so_path),
+            # 尝试添加常见前缀
+            os.path.join(symbols_path, "system", so_path),
+            os.path.join(symbols_path, "vendor", so_path),
+            os.path.join(symbols_path, "apex", so_path),
+        ]
+        
+        # 如果so_path已经包含system/vendor等前缀，去掉重复前缀
+        if so_path.startswith(("system/", "vendor/", "apex/")):
+            base_path = os.path.join(symbols_path, so_path)
+            search_paths.insert(0, base_path)
+        
+        # 尝试所有可能的路径
+        for path in search_paths:
+            if os.path.exists(path):
+                so_full_path = path
+                break
+        
+        # 如果通过路径模式找不到，尝试在symbols目录下递归搜索文件
+        if not so_full_path:
+            so_name = os.path.basename(so_path)
+            # 尝试在symbols目录及其子目录中查找同名文件
+            for root, dirs, files in os.walk(symbols_path):
+                if so_name in files:
+                    so_full_path = os.path.join(root, so_name)
+                    break
+        
+        # 更新缓存
+        SO_CACHE[cache_key] = so_full_path
+    
+    if so_full_path:
+        tool = "llvm-addr2line.exe" if vendor_version != 's' else "addr2line"
+        tool_path = get_tool_path(tool, tools_dir)
+        
+        # 确保工具路径存在
+        if not os.path.exists(tool_path):
+            return f"[Error] Tool {tool} not found at {tool_path}"
+        
+        # 构造命令并执行
+        cmd_line = f'"{tool_path}" -a -i -Cfe "{so_full_path}" {address}'
+        
+        try:
+            result = subprocess.run(
+                cmd_line,
+                shell=True,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='ignore'
+            )
+            
+            if result.returncode == 0:
+                return result.stdout
+            else:
+                error_msg = f"[Error] Command failed with return code {result.returncode}\n"
+                error_msg += f"Stderr: {result.stderr}"
+                return error_msg
+                
+        except Exception as e:
+            error_msg = f"[Error] Failed to execute command: {str(e)}"
+            return error_msg
+    else:
+        # 错误信息写入解析结果和任务输出，不逐帧写日志
+        error_msg = f"[Error] {so_path} not found in symbols ({symbols_path})"
+        
+        # 建议可能的查找路径
+        suggestions = []
+        for prefix in ["", "system/", "vendor/", "apex/"]:
+            suggestions.append(os.path.join(symbols_path, prefix + so_path))
+        
+        suggestion_msg = "\nTried paths:\n" + "\n".join([f"  - {p}" for p in suggestions])
+        return error_msg + suggestion_msg
+
+def start_parse(task, symbols_system, tombstone_file, parse_backtrace_tools_dir, version):
+    """任务引擎的函数任务：解析 tombstone 文件或目录，返回结果文件列表（换行分隔）"""
+    start_time = time.time()
+
+    # 清空缓存，开始新的解析
+    global SO_CACHE
+    SO_CACHE.clear()
+    task.write(f"Starting parse of {tombstone_file}")
+
+    if os.path.isdir(tombstone_file): #判断是否为文件夹
+        result_files = parse_tomb_directory(
+            symbols_system, tombstone_file, parse_backtrace_tools_dir, version, task
+        )
+        result_message = "\n".join(result_files)
+    else:
+        result_file = parse_single_tomb(
+            symbols_system, tombstone_file, parse_backtrace_tools_dir, version, task
+        )
+        result_message = result_file
+
+    end_time = time.time()
+    elapsed_time = end_time - start_time
+    cache_hit_rate = len([v for v in SO_CACHE.values() if v]) / len(SO_CACHE) if SO_CACHE else 0
+    
+    task.write(f"Parse completed!")
+    task.write(f"Results:\n{result_message}")
+    task.write(f"Time: {elapsed_time:.2f}s")
+    task.write(f"Cache stats: {len(SO_CACHE)} entries, hit rate: {cache_hit_rate:.1%}")
+    
+    return result_message
+
+class TombstoneParserCardsInfo(ScrollArea):
+    """ TombstoneParserCardsInfo Subinterface """
+
+    def __init__(self, parent=None, routeKey=None):
+        super().__init__(parent=parent)
+
+        self.view = QWidget(self)
+
+        self.routeKey = routeKey
+
+        self.vBoxLayout = QVBoxLayout(self.view)
+        self.appCard = AppInfoCard(parent=self)
+        #self.galleryCard = GalleryCard(self)
+        self.descriptionCard = DescriptionCard(self)
+        self.settingCard = SettinsCard(self)
+        #self.systemCard = SystemRequirementCard(self)
+
+        self.lightBox = LightBox(self)
+        self.lightBox.hide()
+        #self.galleryCard.flipView.itemClicked.connect(self.showLightBox)
+
+        self.setWidget(self.view)
+        self.setWidgetResizable(True)
+        self.setObjectName(routeKey)
+
+        self.vBoxLayout.setSpacing(25)
+        self.vBoxLayout.setContentsMargins(0, 0, 10, 30)
+        self.vBoxLayout.addWidget(self.appCard, 0, Qt.AlignmentFlag.AlignTop)
+        #self.vBoxLayout.addWidget(self.galleryCard, 0, Qt.AlignmentFlag.AlignTop)
+        self.vBoxLayout.addWidget(self.descriptionCard, 1, Qt.AlignmentFlag.AlignTop)
+        self.vBoxLayout.addWidget(self.settingCard, 2, Qt.AlignmentFlag.AlignTop)
+
+        #self.vBoxLayout.addWidget(self.systemCard, 0, Qt.AlignmentFlag.AlignTop)
+
+        self.enableTransparentBackground()
+
+    def saveTabState(self):
+        """标签页休眠前保存选择的路径和解析结果"""
+        card = self.settingCard
+        state = {name: getattr(card, name) for name in
+                 ("symbolsdir", "tombstonefile", "tombstonedir", "tombstone", "vendor_version", "result_message")}
+        state["tombstone_type"] = card.tombstonecomboBox.currentIndex()
+        state["vendor"] = card.vendorcomboBox.currentText()
+        state["scroll"] = self.verticalScrollBar().value()
+        return state
+
+    def restoreTabState(self, state):
+        """休眠的标签页重新显示时恢复状态"""
+        card = self.settingCard
+        card.tombstonecomboBox.setCurrentIndex(state["tombstone_type"])
+        card.vendorcomboBox.setCurrentText(state["vendor"])
+        # 下拉框的信号会修改 vendor_version，最后再还原属性
+        for name in ("symbolsdir", "tombstonefile", "tombstonedir", "tombstone", "vendor_version", "result_message"):
+            setattr(card, name, state[name])
+
+        for path, button, group in ((card.symbolsdir, card.symbolschooseButton, card.symbolsgroup),
+                                    (card.tombstonefile, card.tombstonefilechooseButton, card.tombstonefilegroup),
+                                    (card.tombstonedir, card.tombstonedirchooseButton, card.tombstonedirgroup)):
+            if path:
+                button.setText("已选择")
+                group.setContent(path)
+        QTimer.singleShot(0, lambda: self.verticalScrollBar().setValue(state["scroll"]))
+
+    def showLightBox(self):
+        index = self.galleryCard.flipView.currentIndex()
+        self.lightBox.setCurrentIndex(index)
+        self.lightBox.fadeIn()
+
+    def resizeEvent(self, e):
+        super().resizeEvent(e)
+        self.lightBox.resize(self.size())
+
+class LightBox(QWidget):
+    """ Light box """
+
+    def __init__(self, parent=None):
+        super().__init__(parent=parent)
+        if isDarkTheme():
+            tintColor = QColor(32, 32, 32, 200)
+        else:
+            tintColor = QColor(255, 255, 255, 160)
+
+        self.acrylicBrush = AcrylicBrush(self, 30, tintColor, QColor(0, 0, 0, 0))
+
+        self.opacityEffect = QGraphicsOpacityEffect(self)
+        self.opacityAni = QPropertyAnimation(self.opacityEffect, b"opacity", self)
+        self.opacityEffect.setOpacity(1)
+        self.setGraphicsEffect(self.opacityEffect)
+
+        self.vBoxLayout = QVBoxLayout(self)
+        self.closeButton = TransparentToolButton(FluentIcon.CLOSE, self)
+        self.flipView = HorizontalFlipView(self)
+        self.nameLabel = BodyLabel('屏幕截图 1', self)
+        self.pageNumButton = PillPushButton('1 / 4', self)
+
+        self.pageNumButton.setCheckable(False)
+        self.pageNumButton.setFixedSize(80, 32)
+        setFont(self.nameLabel, 16, QFont.Weight.DemiBold)
+
+        self.closeButton.setFixedSize(32, 32)
+        self.closeButton.setIconSize(QSize(14, 14))
+        self.closeButton.clicked.connect(self.fadeOut)
+
+        self.vBoxLayout.setContentsMargins(26, 28, 26, 28)
+        self.vBoxLayout.addWidget(self.closeButton, 0, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignTop)
+        self.vBoxLayout.addWidget(self.flipView, 1)
+        self.vBoxLayout.addWidget(self.nameLabel, 0, Qt.AlignmentFlag.AlignHCenter)
+        self.vBoxLayout.addSpacing(10)
+        self.vBoxLayout.addWidget(self.pageNumButton, 0, Qt.AlignmentFlag.AlignHCenter)
+
+        self.flipView.addImages([
+            '{}/images/shoko1.jpg'.format(resource_path), '{}/images/shoko2.jpg'.format(resource_path),
+            '{}/images/shoko3.jpg'.format(resource_path), '{}/images/shoko4.jpg'.format(resource_path),
+        ])
+        self.flipView.currentIndexChanged.connect(self.setCurrentIndex)
+
+    def setCurrentIndex(self, index: int):
+        self.nameLabel.setText(f'屏幕截图 {index + 1}')
+        self.pageNumButton.setText(f'{index + 1} / {self.flipView.count()}')
+        self.flipView.setCurrentIndex(index)
+
+    def paintEvent(self, e):
+        if self.acrylicBrush.isAvailable():
+            return self.acrylicBrush.paint()
+
+        painter = QPainter(self)
+        painter.setPen(Qt.NoPen)
+        if isDarkTheme():
+            painter.setBrush(QColor(32, 32, 32))
+        else:
+            painter.setBrush(QColor(255, 255, 255))
+
+        painter.drawRect(self.rect())
+
+    def resizeEvent(self, e):
+        w = self.width() - 52
+        self.flipView.setItemSize(QSize(w, w * 9 // 16))
+
+    def fadeIn(self):
+        rect = QRect(self.mapToGlobal(QPoint()), self.size())
+        self.acrylicBrush.grabImage(rect)
+
+        self.opacityAni.setStartValue(0)
+        self.opacityAni.setEndValue(1)
+        self.opacityAni.setDuration(150)
+        self.opacityAni.start()
+        self.show()
+
+    def fadeOut(self):
+        self.opacityAni.setStartValue(1)
+        self.opacityAni.setEndValue(0)
+        self.opacityAni.setDuration(150)
+        self.opacityAni.finished.connect(self._onAniFinished)
+        self.opacityAni.start()
+
+    def _onAniFinished(self):
+        self.opacityAni.finished.disconnect()
+        self.hide()
+
+class TombstoneParserInterface:
+    def __init__(self, parent=None, mainWindow=None):
+        self.parent = parent
+        self.mainWindow = mainWindow
+
+    def addTab(self, routeKey, text, icon):
+        logger.info('[TAB ADD] {}'.format(routeKey))
+        self.mainWindow.tabBar.addTab(routeKey, text, icon)
+
+        # tab左对齐
+        self.mainWindow.showInterface.addWidget(TombstoneParserCardsInfo(routeKey=routeKey))
+        self.mainWindow.showInterface.setCurrentWidget(self.mainWindow.showInterface.findChild(TombstoneParserCardsInfo, routeKey))
+        self.mainWindow.stackedWidget.setCurrentWidget(self.mainWindow.showInterface)
+        self.mainWindow.tabBar.setCurrentIndex(self.mainWindow.tabBar.count() - 1)
+
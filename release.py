@@ -6,10 +6,20 @@
 """
 import os
 import sys
+import json
 import shutil
-import zipfile
+import struct
+import hashlib
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import subprocess
+import time
+
+# 压缩包中所有文件使用固定的时间戳，相同的输入得到字节完全相同的压缩包
+# 设置了 SOURCE_DATE_EPOCH 环境变量时使用该时间
+ZIP_EPOCH = int(os.environ.get("SOURCE_DATE_EPOCH", 315532800))  # 1980-01-01
+ZIP_LEVEL = 9
 
 def get_version():
     """从命令行参数获取版本号"""
@@ -55,6 +65,81 @@ def build_executable():
     print("打包成功!")
     return True
 
+def _dos_datetime(epoch):
+    t = time.gmtime(max(epoch, 315532800))
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+def _compress_file(path):
+    """读取并压缩单个文件，返回 (方式, crc32, 原始大小, 数据, sha256)；zlib 压缩时会释放 GIL，可以多线程并行"""
+    data = Path(path).read_bytes()
+    compressor = zlib.compressobj(ZIP_LEVEL, zlib.DEFLATED, -15)
+    packed = compressor.compress(data) + compressor.flush()
+    # 压缩后没有变小的文件直接存储
+    if len(packed) >= len(data):
+        method, packed = 0, data
+    else:
+        method = 8
+    return method, zlib.crc32(data), len(data), packed, hashlib.sha256(data).hexdigest()
+
+def write_deterministic_zip(zip_path, entries, workers=None):
+    """
+    多线程压缩并写入 zip 文件
+    entries: [(压缩包内路径, 文件路径), ...]，按压缩包内路径排序写入
+    所有文件使用固定时间戳和权限，相同的输入总是得到字节完全相同的压缩包
+    返回 {压缩包内路径: sha256}
+    """
+    entries = sorted(entries, key=lambda e: e[0])
+    if len(entries) >= 0xFFFF:
+        raise ValueError("文件数量超过 zip 格式限制")
+    dos_time, dos_date = _dos_datetime(ZIP_EPOCH)
+    workers = workers or os.cpu_count() or 4
+    hashes = {}
+    central = []
+
+    with open(zip_path, "wb") as out, ThreadPoolExecutor(workers) as pool:
+        # 限制同时在内存中的压缩结果数量，按顺序写出
+        pending = []
+        queue = iter(entries)
+        for arcname, path in queue:
+            pending.append((arcname, pool.submit(_compress_file, path)))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            arcname, future = pending.pop(0)
+            nxt = next(queue, None)
+            if nxt is not None:
+                pending.append((nxt[0], pool.submit(_compress_file, nxt[1])))
+
+            method, crc, size, packed, digest = future.result()
+            if size >= 0xFFFFFFFF or out.tell() >= 0xFFFFFFFF:
+                raise ValueError("文件过大，超过 zip 格式限制: {}".format(arcname))
+            name = arcname.encode("utf-8")
+            offset = out.tell()
+            # 本地文件头；标志位 0x800 表示文件名为 UTF-8
+            out.write(struct.pack("<IHHHHHIIIHH", 0x04034b50, 20, 0x800, method, dos_time, dos_date,
+                                  crc, len(packed), size, len(name), 0))
+            out.write(name)
+            out.write(packed)
+            central.append(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014b50, 20, 20, 0x800, method, dos_time, dos_date,
+                                       crc, len(packed), size, len(name), 0, 0, 0, 0, 0o100644 << 16, offset) + name)
+            hashes[arcname] = digest
+
+        cd_offset = out.tell()
+        for record in central:
+            out.write(record)
+        cd_size = out.tell() - cd_offset
+        out.write(struct.pack("<IHHHHIIH", 0x06054b50, 0, 0, len(central), len(central), cd_size, cd_offset, 0))
+
+    return hashes
+
+def write_hash_manifest(manifest_path, name, version, hashes):
+    """写入文件哈希清单（与插件增量更新使用的清单格式相同）"""
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"name": name, "version": version, "files": hashes}, f, indent=1, sort_keys=True, ensure_ascii=False)
+
 def create_zip_package(version):
     """创建 ZIP 发布包"""
     print("\n" + "="*60)
@@ -81,16 +166,20 @@ def create_zip_package(version):
     print(f"正在压缩: {dist_dir} -> {zip_path}")
     
     # 创建 ZIP 文件
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(dist_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arcname = file_path.relative_to(dist_dir.parent)
-                zipf.write(file_path, arcname)
-                print(f"  添加: {arcname}")
-    
-    print(f"ZIP 包创建成功: {zip_path}")
+    entries = []
+    for root, dirs, files in os.walk(dist_dir):
+        for file in files:
+            file_path = Path(root) / file
+            entries.append((file_path.relative_to(dist_dir.parent).as_posix(), file_path))
+    hashes = write_deterministic_zip(zip_path, entries)
+
+    # 文件哈希清单放在压缩包旁边
+    manifest_path = release_dir / f"OneMore-v{version}-Windows-x64.manifest.json"
+    write_hash_manifest(manifest_path, zip_filename, version, hashes)
+    
+    print(f"ZIP 包创建成功: {zip_path}（{len(hashes)} 个文件）")
     print(f"文件大小: {zip_path.stat().st_size / 1024 / 1024:.2f} MB")
+    print(f"文件清单: {manifest_path}")
     
     return zip_path
 
@@ -142,6 +231,7 @@ def create_release_notes(version):
 
 def print_github_release_instructions(version, zip_path, notes_file):
     """打印 GitHub Release 创建说明"""
+    manifest_path = Path(zip_path).with_name(Path(zip_path).stem + ".manifest.json")
     print("\n" + "="*60)
     print("GitHub Release 创建说明")
     print("="*60)
@@ -156,6 +246,7 @@ def print_github_release_instructions(version, zip_path, notes_file):
 
 3. 上传文件:
    - {zip_path}
+   - {manifest_path}
 
 4. 发布:
    - 如果是正式版本，取消勾选 "This is a pre-release"
@@ -165,7 +256,7 @@ def print_github_release_instructions(version, zip_path, notes_file):
    gh release create v{version} \\
        --title "OneMore v{version}" \\
        --notes-file {notes_file} \\
-       {zip_path}
+       {zip_path} {manifest_path}
 """)
 
 def main():